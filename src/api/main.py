@@ -431,7 +431,8 @@ async def query_with_session(
                 use_memory=True,
                     memory_persist_dir=f"./memory_store/session_{session_id}",
                     use_cache=True,
-                    cache_file=f"query_cache_{session_id}.json"
+                    cache_file=f"query_cache_{session_id}.json",
+                    semantic_cache_dir=f"./semantic_cache/session_{session_id}"
             )
             active_generators[session_id] = sql_generator
         except Exception as e:
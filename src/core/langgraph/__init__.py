@@ -6,6 +6,7 @@ This package contains the modular components for the SmartSQLGenerator:
 - prompts: Prompt management and templates
 - memory: Memory and conversation context management
 - cache: Query caching functionality
+- semantic_cache: Similarity-based caching of LLM results
 - session_context: Session context management
 - query_analysis: Query analysis and planning
 - sql_generation: SQL generation and validation
@@ -19,8 +20,15 @@ This package contains the modular components for the SmartSQLGenerator:
 - sql_generator: Main SQL generator class
 """
 
-from .sql_generator import SmartSQLGenerator, SQLGenerator
-from .state import SQLGeneratorState
+import importlib
+
+# The main classes are imported on first access, so loading a single submodule
+# (e.g. prompts or state) does not pull in the whole generator and LangGraph stack
+_LAZY_EXPORTS = {
+    "SmartSQLGenerator": ".sql_generator",
+    "SQLGenerator": ".sql_generator",
+    "SQLGeneratorState": ".state",
+}
 
 # Export the main classes
 __all__ = [
@@ -29,6 +37,15 @@ __all__ = [
     "SQLGeneratorState"
 ]
 
+
+def __getattr__(name):
+    """Import an exported class the first time it is accessed"""
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Version information
 __version__ = "2.0.0"
 __author__ = "SQL Generator Team"
@@ -1,5 +1,6 @@
 import json
 import logging
+import orjson
 from time import sleep
 import traceback
 from decimal import Decimal
@@ -16,16 +17,15 @@ from ...observability.langfuse_config import observe_function
 # Set up logging
 logger = logging.getLogger(__name__)
 
-class DecimalEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles Decimal, datetime, and other non-serializable types"""
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        elif isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        elif hasattr(obj, 'isoformat'):
-            return obj.isoformat()
-        return super().default(obj)
+def _json_default(obj):
+    """orjson fallback that handles Decimal, datetime, and other non-serializable types"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    elif isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    elif hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 class AnalyticalManager:
     """Manages analytical question generation and comprehensive analysis"""
@@ -542,7 +542,9 @@ class AnalyticalManager:
             
             # Generate enhanced contextual queries using LLM
             response = await self.llm.ainvoke(
-                self.prompts_manager.flexible_query_generation_prompt.format_messages(**prompt_values)
+                self.prompts_manager.format_messages_cached(
+                    self.prompts_manager.flexible_query_generation_prompt, **prompt_values
+                )
             )
             
             queries_text = self._extract_response_content(response)
@@ -601,7 +603,9 @@ class AnalyticalManager:
             logger.info("Calling LLM for analytical questions generation")
             
             response = await self.llm.ainvoke(
-                self.prompts_manager.analytical_questions_prompt.format_messages(**prompt_values)
+                self.prompts_manager.format_messages_cached(
+                    self.prompts_manager.get_analytical_questions_prompt(user_query), **prompt_values
+                )
             )
             print(f"🔍 DEBUG: LLM response received. Type: {type(response)}")
             logger.debug(f"LLM response type: {type(response)}")
@@ -882,7 +886,9 @@ class AnalyticalManager:
             
             # Generate queries using the flexible prompt - with proper exception handling
             try:
-                messages = self.prompts_manager.flexible_query_generation_prompt.format_messages(**prompt_values)
+                messages = self.prompts_manager.format_messages_cached(
+                    self.prompts_manager.flexible_query_generation_prompt, **prompt_values
+                )
                 response = await self.llm.ainvoke(messages)
                 print(f"🔍 DEBUG: LLM invoke successful - response type: {type(response)}")
             except Exception as llm_error:
@@ -1569,9 +1575,13 @@ class AnalyticalManager:
                     else:
                         print(f"🔍 DEBUG:   -> All {total_available} rows included (≤10 total)")
             
-            # Convert results to JSON string with custom encoder to handle Decimal objects
+            # Convert results to compact JSON with a fallback for Decimal objects
             try:
-                analytical_results_json = json.dumps(results_summary, indent=2, cls=DecimalEncoder)
+                analytical_results_json = orjson.dumps(
+                    results_summary,
+                    default=_json_default,
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                ).decode()
                 logger.debug(f"Results successfully serialized to JSON: {len(analytical_results_json)} characters")
                 print(f"🔍 DEBUG: Results successfully serialized to JSON: {len(analytical_results_json)} characters")
             except Exception as json_error:
@@ -1597,7 +1607,9 @@ class AnalyticalManager:
             
             # Generate comprehensive analysis
             response = await self.llm.ainvoke(
-                self.prompts_manager.comprehensive_analysis_prompt.format_messages(**prompt_values)
+                self.prompts_manager.format_messages_cached(
+                    self.prompts_manager.comprehensive_analysis_prompt, **prompt_values
+                )
             )
             
             analysis = self._extract_response_content(response)
@@ -1,20 +1,28 @@
+import os
 import json
 import hashlib
-from typing import Dict
+from typing import Dict, Optional
 
 
 class CacheManager:
     """Manages caching functionality for the SQL generator"""
     
-    def __init__(self, use_cache: bool = True, cache_file: str = "query_cache.json"):
+    # Parsed schemas kept on disk; older fingerprints are dropped first
+    MAX_SCHEMA_ENTRIES = 8
+    
+    def __init__(self, use_cache: bool = True, cache_file: str = "query_cache.json",
+                 schema_cache_file: Optional[str] = None):
         self.use_cache = use_cache
         self.cache_file = cache_file
+        # Defaults to a file next to the query cache, so per-session caches do not share it
+        self.schema_cache_file = schema_cache_file or f"{os.path.splitext(cache_file)[0]}_schema.json"
         self.cache = self._load_cache() if use_cache else {}
+        self.schema_cache = self._load_cache(self.schema_cache_file) if use_cache else {}
     
-    def _load_cache(self) -> Dict:
+    def _load_cache(self, cache_file: Optional[str] = None) -> Dict:
         """Load cache from file"""
         try:
-            with open(self.cache_file, 'r') as f:
+            with open(cache_file or self.cache_file, 'r') as f:
                 return json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
@@ -70,4 +78,49 @@ class CacheManager:
             del self.cache[question_hash]
             self._save_cache()
             return True
-        return False 
\ No newline at end of file
+        return False 
+    
+    def get_schema_cache(self, fingerprint: str) -> Optional[Dict]:
+        """Get the parsed schema data stored for a schema fingerprint"""
+        if not self.use_cache:
+            return None
+        
+        return self.schema_cache.get(fingerprint)
+    
+    def set_schema_cache(self, fingerprint: str, blob: Dict) -> None:
+        """Store parsed schema data for a schema fingerprint"""
+        if not self.use_cache:
+            return
+        
+        self.schema_cache.pop(fingerprint, None)
+        self.schema_cache[fingerprint] = blob
+        while len(self.schema_cache) > self.MAX_SCHEMA_ENTRIES:
+            del self.schema_cache[next(iter(self.schema_cache))]
+        self._save_schema_cache()
+    
+    def remove_schema_cache(self, fingerprint: str) -> bool:
+        """Remove the parsed schema data stored for one schema fingerprint"""
+        if not self.use_cache:
+            return False
+        
+        if fingerprint in self.schema_cache:
+            del self.schema_cache[fingerprint]
+            self._save_schema_cache()
+            return True
+        return False
+    
+    def clear_schema_cache(self) -> None:
+        """Clear the parsed schema cache"""
+        self.schema_cache = {}
+        self._save_schema_cache()
+    
+    def _save_schema_cache(self) -> None:
+        """Save parsed schema cache to file"""
+        if not self.use_cache:
+            return
+        
+        try:
+            with open(self.schema_cache_file, 'w') as f:
+                json.dump(self.schema_cache, f)
+        except Exception as e:
+            print(f"Error saving schema cache: {e}")
\ No newline at end of file
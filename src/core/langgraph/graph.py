@@ -311,8 +311,8 @@ class GraphManager:
             analysis = analyzer.analyze_question(state["question"])
             
             # Determine workflow type based on simple classification
-            is_conversational = analysis["is_conversational"]
-            requires_analysis = analysis["requires_analysis"]
+            is_conversational = analysis.is_conversational
+            requires_analysis = analysis.requires_analysis
             
             if is_conversational:
                 workflow_type = "conversational"
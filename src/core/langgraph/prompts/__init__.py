@@ -0,0 +1,946 @@
+import hashlib
+import os
+import re
+import sys
+from collections import OrderedDict
+from importlib.resources import files
+from string import Formatter
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate, PromptTemplate
+from langchain_core.prompts.chat import BaseMessagePromptTemplate
+from pydantic import ConfigDict
+
+# How much of the worked-example prose goes into the larger prompts:
+# "full" keeps every example, "compact" keeps one example per rule and
+# "minimal" keeps only the rule statements. PROMPT_COMPACT=1 selects "compact".
+PromptMode = Literal["full", "compact", "minimal"]
+_PROMPT_MODE_RANK = {"minimal": 0, "compact": 1, "full": 2}
+DEFAULT_PROMPT_MODE: PromptMode = "compact" if os.getenv("PROMPT_COMPACT") == "1" else "full"
+
+# Prose shared verbatim by several prompts; interned so every prompt reuses one copy
+QUOTING_RULES = sys.intern(
+    "   - **TABLE NAMES**: Always quote table names that contain mixed case, special characters, or spaces "
+    "(e.g., use `public.\"IT_Professional_Services\"` NOT `public.IT_Professional_Services`)\n"
+    "   - **SCHEMA NAMES**: Quote schema names if they contain mixed case or special characters\n"
+    "   - **COLUMN NAMES**: ONLY quote column names that contain spaces, special characters, or reserved words\n"
+    "   - **PostgreSQL Case Sensitivity**: Unquoted identifiers are converted to lowercase in PostgreSQL, "
+    "so mixed-case table/schema names MUST be quoted"
+)
+SQL_ONLY_OUTPUT = sys.intern(
+    "Provide ONLY the SQL query with no additional text, explanation, or markdown formatting."
+)
+JSON_ONLY_OUTPUT = sys.intern(
+    "Do not include any explanatory text, markdown formatting, or code blocks outside the JSON."
+)
+
+# The three largest system prompts live next to this module as markdown resources.
+# Each file is read once per process; "{memory_var}" marks where the memory block goes
+# and "<!-- key: value -->" lines open sections that only some prompt variants include
+# ("mode" sections for the prompt modes, "query" sections for the query kinds).
+_PROMPT_TEXT_CACHE: Dict[str, str] = {}
+_SECTION_MARKER = re.compile(r"^<!-- \w+: (\w+) -->\n", re.MULTILINE)
+
+# Built prompts depend only on (prompt name, use_memory, prompt mode), so every
+# PromptsManager with the same settings shares one template instance. Because the
+# shared templates live for the whole process, their ids can key the LRU of rendered
+# message lists; inputs larger than the size limit are rendered every time.
+# Prompts without a memory block are shared between the memory and no-memory managers.
+_SHARED_PROMPTS: Dict[Tuple[str, bool, str], ChatPromptTemplate] = {}
+_MEMORYLESS_PROMPTS = frozenset({"flexible_query", "edit_verification"})
+_RENDER_CACHE: "OrderedDict[Tuple[int, str], List[BaseMessage]]" = OrderedDict()
+_RENDER_CACHE_SIZE = 512
+_RENDER_CACHE_MAX_CHARS = 200_000
+
+
+def _load_prompt_text(name: str) -> str:
+    """Return the text of prompts/<name>.md without its final newline"""
+    text = _PROMPT_TEXT_CACHE.get(name)
+    if text is None:
+        text = files(__name__).joinpath(f"{name}.md").read_text(encoding="utf-8")
+        if text.endswith("\n"):
+            text = text[:-1]
+        _PROMPT_TEXT_CACHE[name] = text
+    return text
+
+
+def _load_prompt_sections(name: str) -> Tuple[Tuple[str, str], ...]:
+    """Split prompts/<name>.md into (tag, text) sections"""
+    parts = _SECTION_MARKER.split(_load_prompt_text(name))
+    return tuple(zip(parts[1::2], parts[2::2]))
+
+
+# Question generation branches on whether the user asked about particular entities.
+# Classifying the query up front lets the prompt carry only the matching branch.
+# The check is a single word scan with set lookups instead of a regex alternation.
+QueryKind = Literal["specific", "vague"]
+_SPECIFIC_ROLES = (
+    "developer", "programmer", "consultant", "analyst", "manager", "architect", "engineer", "tester",
+    "administrator", "designer", "specialist",
+)
+_SPECIFIC_QUERY_WORDS = frozenset((
+    "ind", "india", "usa", "uk", "germany", "france", "canada", "mexico", "brazil", "poland", "china", "japan",
+    "australia", "singapore", "philippines", "romania", "spain", "netherlands", "ireland", "switzerland",
+    *_SPECIFIC_ROLES, *(role + "s" for role in _SPECIFIC_ROLES),
+    "sap", "java", "python", "oracle", "salesforce", "cloud", "devops",
+    "junior", "senior", "expert", "advanced", "elementary", "intermediate",
+))
+_SPECIFIC_QUERY_PAIRS = frozenset((("united", "states"), ("united", "kingdom")))
+_QUERY_WORD_RE = re.compile(r"\w+")
+_QUESTION_KIND_STEP = {
+    None: "Determine if this is SPECIFIC (asks for particular services/roles/countries/regions) or VAGUE (broad market exploration)",
+    "specific": "This is a SPECIFIC query (asks for particular services/roles/countries/regions)",
+    "vague": "This is a VAGUE query (broad market exploration)",
+}
+_QUESTION_KIND_DIVERSITY = {
+    "specific": "   - **For SPECIFIC queries**: Each question must explore a DIFFERENT dimension (overall market, geographic, temporal, role seniority) [MAX 2-3 TOTAL]",
+    "vague": "   - **For VAGUE queries**: Focus on diverse dimensions - overall market, geographic arbitrage, role seniority variations (2-3 questions) [MAX 2-3 TOTAL]",
+}
+
+
+def _classify_query(user_query: str) -> QueryKind:
+    """Classify a sourcing inquiry as SPECIFIC (names years, countries, roles, skills) or VAGUE"""
+    text = (user_query or "").lower()
+    words = _QUERY_WORD_RE.findall(text)
+    if (
+        ".net" in text
+        or not _SPECIFIC_QUERY_WORDS.isdisjoint(words)
+        or any(len(word) == 4 and word[:2] in ("19", "20") and word.isdigit() for word in words)
+        or not _SPECIFIC_QUERY_PAIRS.isdisjoint(zip(words, words[1:]))
+    ):
+        return "specific"
+    return "vague"
+
+
+class CompiledTemplate:
+    """Template string parsed once into literal and field segments"""
+    
+    __slots__ = ("template", "input_variables", "_segments")
+    
+    def __init__(self, template: str):
+        self.template = template
+        segments: List[Tuple[bool, str]] = []
+        for literal, field_name, _, _ in Formatter().parse(template):
+            if literal:
+                segments.append((False, literal))
+            if field_name is not None:
+                segments.append((True, field_name))
+        self._segments = tuple(segments)
+        self.input_variables = sorted({seg for is_field, seg in segments if is_field})
+    
+    def render(self, **kwargs: Any) -> str:
+        """Substitute the field values without re-parsing the template"""
+        return "".join(str(kwargs[seg]) if is_field else seg for is_field, seg in self._segments)
+
+
+class PrebuiltSystemMessage(BaseMessagePromptTemplate):
+    """System message prompt backed by a CompiledTemplate"""
+    
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    template: CompiledTemplate
+    
+    def __init__(self, template: CompiledTemplate, **kwargs: Any):
+        super().__init__(template=template, **kwargs)
+    
+    @property
+    def input_variables(self) -> List[str]:
+        return list(self.template.input_variables)
+    
+    def format_messages(self, **kwargs: Any) -> List[BaseMessage]:
+        return [SystemMessage(content=self.template.render(**kwargs))]
+
+
+def _values_digest(values: Dict[str, Any]) -> str:
+    """Content hash of a set of prompt values"""
+    digest = hashlib.blake2b(digest_size=16)
+    for key in sorted(values):
+        digest.update(f"{key}\0{values[key]}\0".encode())
+    return digest.hexdigest()
+
+
+def _human_message(template: str, *input_variables: str) -> HumanMessagePromptTemplate:
+    """Human message prompt with its input variables declared up front"""
+    return HumanMessagePromptTemplate(
+        prompt=PromptTemplate(input_variables=list(input_variables), template=template)
+    )
+
+
+# Human messages of the comprehensive analysis and flexible query prompts; they do not
+# vary with memory or prompt mode, so every built prompt reuses the same instances
+_COMPREHENSIVE_HUMAN_MESSAGE = _human_message("### CLIENT'S ORIGINAL SOURCING INQUIRY:\n{user_query}\n\n### MARKET INTELLIGENCE RESULTS:\n{analytical_results}\n\nProvide a focused analysis using ALL available data dimensions with relevant tables that comprehensively address the user's question.\n\n**CRITICAL DATA IDENTIFICATION**: The results contain mixed data types in a single array. Look for:\n- Objects with \"supplier\" key → supplier analysis data\n- Objects with \"country_of_work\" key → geographic analysis data\n- Objects with \"year\" key → temporal trends data\n- Objects with \"role_seniority\" key → role seniority data\n\n**DATA SAMPLING STRATEGY**: The query results use intelligent sampling:\n- **≤10 rows**: All rows are included in the results\n- **>10 rows**: Only top 5 + bottom 5 rows are shown (out of total available)\n- **Sampling Info**: Each query includes \"sampling_info\" and \"total_rows_available\" fields\n- **Analysis Impact**: When analyzing data, consider that for large datasets you're seeing the extremes (highest and lowest values), which is ideal for identifying rate ranges and competitive positioning\n\n**DYNAMIC SECTION CREATION**: Create sections ONLY for data types that actually exist in the analytical results:\n- If ANY objects have \"supplier\" key → create supplier analysis tables and insights\n- If ANY objects have \"country_of_work\" key → create geographic analysis section with country data\n- If ANY objects have \"year\" key → create temporal trends section with yearly data\n- If ANY objects have \"role_seniority\" key → create role seniority analysis section\n\n**CRITICAL**: Examine the entire results array carefully and create sections based on what data actually exists AND provides unique value. Avoid redundant sections that repeat the same rate ranges or information. Use descriptive section names that fit the content context. DO NOT mention missing data types unless the user specifically requested them. Focus on directly answering the user's question. Use multiple tables when needed (max 5 rows each with balanced high-low representation), only ranges (Q1-Q3 format), organize insights with contextual markdown headers, and keep the response concise but insightful. When sampling is applied, the analysis benefits from seeing both high and low extremes in the data.", "user_query", "analytical_results")
+
+_FLEXIBLE_QUERY_HUMAN_MESSAGE = _human_message("""USER QUESTION: {question}
+
+### PREVIOUS QUESTIONS CONTEXT:
+{previous_questions}
+
+INSTRUCTIONS: Generate 1-5 contextually relevant SQL queries that will help answer this question. Use the actual column names and values from the database schema.
+
+**CRITICAL REDUNDANCY AVOIDANCE**: Check the previous questions context above. This includes:
+1. **Main analytical questions** (e.g., "What is the average hourly rate for SAP Developers?")
+2. **Specific query descriptions** (e.g., "Hourly rate distribution for SAP Developers by supplier")
+
+DO NOT generate queries that overlap with ANY of the previous questions or query descriptions. If previous questions covered supplier analysis, focus on COMPLETELY DIFFERENT dimensions like geographic, temporal, or role seniority analysis.
+
+**CRITICAL RATE QUERY INSTRUCTION**: When the user asks for "rates", "pricing", or "costs", you MUST generate quartile queries using PERCENTILE_CONT functions instead of simple AVG() queries. This provides much better distribution insights than basic averages.
+
+**CRITICAL ENUM VALUE INSTRUCTION**: Since column enum values are provided in the schema, you MUST use exact equality (=) operators, NOT LIKE patterns. Use the exact enum values provided without pattern matching.
+
+Focus on queries that directly address what the user is asking for with aggregated insights, NOT individual value frequencies or distributions.
+
+CRITICAL: If the user mentions specific entities (roles, specializations, job types), ALL queries must filter to include ONLY those specific entities. Do NOT generate broad queries that return unrelated roles.
+
+COMPOUND ENTITY FILTERING: For compound requests like "SAP Developer", "Java Consultant", or "Senior Manager", filter by BOTH parts - the specialization AND the role type. Never filter only by specialization and return all roles within that category.
+
+**DIMENSION DIVERSITY REQUIREMENT**: If previous questions covered specific dimensions, generate queries for DIFFERENT dimensions:
+- If previous: supplier analysis → Generate: geographic, temporal, or role seniority analysis
+- If previous: geographic analysis → Generate: supplier, temporal, or role seniority analysis
+- If previous: temporal analysis → Generate: supplier, geographic, or role seniority analysis
+- If previous: role seniority analysis → Generate: supplier, geographic, or temporal analysis
+
+RANGE PRIORITY: For ALL rate-related questions, prioritize range analysis (Range and Median Range) over simple averages to provide comprehensive distribution insights.
+
+**MANDATORY SUPPLIER ANALYSIS**: ALWAYS include supplier/vendor/partner comparison queries as the PRIMARY focus unless the user explicitly asks for very specific non-supplier analysis. Supplier queries should be generated by default for all rate-related questions.
+
+GEOGRAPHIC ANALYSIS: Include geographic/regional range analysis for rate questions. Generate country/region-based Range and Median Range comparisons to show geographic arbitrage opportunities.
+
+YEARWISE TRENDS: Include year-over-year analysis for the past 2-3 years (2022-2024) where applicable to show temporal trends and changes in the data.
+
+COMPREHENSIVE COVERAGE REQUIREMENT: For rate questions, generate diverse query types including:
+- **MANDATORY OVERALL RANGE**: Total market range without any groupings (no GROUP BY) - ALWAYS REQUIRED for rate questions
+- **MANDATORY SUPPLIER ANALYSIS**: Supplier quartile comparison (GROUP BY supplier_company) - ALWAYS REQUIRED unless user explicitly asks for non-supplier focus
+- Geographic/regional quartile breakdowns (when NOT covered in previous questions)
+- Role seniority quartile comparisons (when NOT covered in previous questions)
+- Temporal trend analysis with quartiles (when NOT covered in previous questions)
+
+CRITICAL LIMIT: Generate a MAXIMUM of 2-3 queries only. Focus on dimensions NOT covered by previous analytical questions to ensure comprehensive, non-redundant coverage.""", "question", "previous_questions")
+
+
+class PromptsManager:
+    """Manages all prompts for the SQL generator"""
+    
+    __slots__ = (
+        "use_memory", "memory_var", "prompt_mode",
+        "sql_prompt", "validation_prompt", "text_response_prompt",
+        "edit_sql_prompt", "edit_verification_prompt", "edit_sql_chain", "edit_verification_chain",
+        "chart_recommendation_prompt",
+        "_question", "_question_specific", "_question_vague", "_comprehensive", "_flexible",
+    )
+    
+    def __init__(self, use_memory: bool = True, prompt_mode: Optional[PromptMode] = None):
+        self.use_memory = use_memory
+        self.memory_var = "{memory}\n\n" if use_memory else ""
+        self.prompt_mode = prompt_mode or DEFAULT_PROMPT_MODE
+        if self.prompt_mode not in _PROMPT_MODE_RANK:
+            raise ValueError(f"Unknown prompt mode: {self.prompt_mode}")
+        
+        # Initialize the small prompts; the large analytical ones are built on first access
+        self.sql_prompt = self._shared_prompt("sql", self._create_sql_prompt)
+        self.validation_prompt = self._shared_prompt("validation", self._create_validation_prompt)
+        self.text_response_prompt = self._shared_prompt("text_response", self._create_text_response_prompt)
+        self._question = None
+        self._question_specific = None
+        self._question_vague = None
+        self._comprehensive = None
+        self._flexible = None
+        self.edit_sql_prompt = None
+        self.edit_verification_prompt = None
+        self.edit_sql_chain = None
+        self.edit_verification_chain = None
+        self.chart_recommendation_prompt = None
+    
+    @property
+    def analytical_questions_prompt(self) -> ChatPromptTemplate:
+        """Analytical questions prompt covering both query kinds, built on first access"""
+        if self._question is None:
+            self._question = self._shared_prompt("question", self._create_analytical_questions_prompt)
+        return self._question
+    
+    @property
+    def question_prompt_specific(self) -> ChatPromptTemplate:
+        """Analytical questions prompt for SPECIFIC queries, built on first access"""
+        if self._question_specific is None:
+            self._question_specific = self._shared_prompt("question_specific", self._create_analytical_questions_prompt, "specific")
+        return self._question_specific
+    
+    @property
+    def question_prompt_vague(self) -> ChatPromptTemplate:
+        """Analytical questions prompt for VAGUE queries, built on first access"""
+        if self._question_vague is None:
+            self._question_vague = self._shared_prompt("question_vague", self._create_analytical_questions_prompt, "vague")
+        return self._question_vague
+    
+    @property
+    def comprehensive_analysis_prompt(self) -> ChatPromptTemplate:
+        """Comprehensive analysis prompt, built on first access"""
+        if self._comprehensive is None:
+            self._comprehensive = self._shared_prompt("comprehensive", self._create_comprehensive_analysis_prompt)
+        return self._comprehensive
+    
+    @property
+    def flexible_query_generation_prompt(self) -> ChatPromptTemplate:
+        """Flexible query generation prompt, built on first access"""
+        if self._flexible is None:
+            self._flexible = self._shared_prompt("flexible_query", self._create_flexible_query_generation_prompt)
+        return self._flexible
+    
+    def _with_memory(self, template: str) -> str:
+        """Fill the memory placeholder of a prompt resource"""
+        return template.replace("{memory_var}", self.memory_var)
+    
+    def _assemble_sections(self, sections: Sequence[Tuple[str, str]]) -> str:
+        """Join the prompt sections that belong in the configured prompt mode"""
+        rank = _PROMPT_MODE_RANK[self.prompt_mode]
+        return "".join(text for mode, text in sections if _PROMPT_MODE_RANK[mode] <= rank)
+    
+    def get_analytical_questions_prompt(self, user_query: str) -> ChatPromptTemplate:
+        """Pick the question generation prompt specialized for this user query"""
+        if _classify_query(user_query) == "specific":
+            return self.question_prompt_specific
+        return self.question_prompt_vague
+    
+    def _shared_prompt(self, name: str, build: Callable[..., ChatPromptTemplate], *args: Any) -> ChatPromptTemplate:
+        """Return the process-wide prompt for this manager's settings, building it once"""
+        key = (name, self.use_memory and name not in _MEMORYLESS_PROMPTS, self.prompt_mode)
+        prompt = _SHARED_PROMPTS.get(key)
+        if prompt is None:
+            prompt = _SHARED_PROMPTS[key] = build(*args)
+        return prompt
+    
+    def format_messages_cached(self, prompt: ChatPromptTemplate, **values: Any) -> List[BaseMessage]:
+        """Format one of the shared prompts, reusing the messages rendered for identical values"""
+        if sum(len(str(value)) for value in values.values()) > _RENDER_CACHE_MAX_CHARS:
+            return prompt.format_messages(**values)
+        key = (id(prompt), _values_digest(values))
+        messages = _RENDER_CACHE.get(key)
+        if messages is None:
+            messages = prompt.format_messages(**values)
+            _RENDER_CACHE[key] = messages
+            if len(_RENDER_CACHE) > _RENDER_CACHE_SIZE:
+                _RENDER_CACHE.popitem(last=False)
+        else:
+            _RENDER_CACHE.move_to_end(key)
+        return list(messages)
+    
+    def _create_sql_prompt(self) -> ChatPromptTemplate:
+        """Create the SQL generation prompt"""
+        return ChatPromptTemplate.from_messages([
+            ("system", f"""You are an expert SQL developer specializing in PostgreSQL databases. Your job is to translate natural language questions into precise and efficient SQL queries that help clients make informed business decisions about service rates and suppliers.
+
+{self.memory_var}### DATABASE SCHEMA:
+{{schema}}
+
+### EXAMPLES OF GOOD SQL PATTERNS:
+{{examples}}
+
+### BUSINESS CONTEXT:
+Your app serves as a decision-making assistant for clients exploring service rates. Clients want to understand supplier offerings, geographical variations, and market trends to make informed sourcing decisions.
+
+### GUIDELINES:
+1. **SUPPLIER-FIRST APPROACH**: Prioritize queries that help clients compare suppliers and understand their competitive positioning
+2. **DECISION-MAKING FOCUS**: Generate queries that provide actionable insights for procurement and sourcing decisions
+3. Create only PostgreSQL-compatible SQL
+4. Focus on writing efficient queries that highlight supplier competitiveness
+5. Use proper table aliases for clarity
+6. Include appropriate JOINs based on database relationships
+7. Include comments explaining complex parts of your query
+8. **IMPORTANT - QUOTING RULES**:
+{QUOTING_RULES}
+9. NEVER use any placeholder values in your final query
+10. Use any available user information (name, role, IDs) from memory to personalize the query if applicable
+11. Use specific values from previous query results when referenced (e.g., "this product", "these customers", "that date")
+12. For follow-up questions or refinements, maintain the filters and conditions from the previous query
+13. If the follow-up question is only changing which columns to display, KEEP ALL WHERE CONDITIONS from the previous query
+14. When user asks for "this" or refers to previous results implicitly, use the context from the previous query
+15. When user refers to "those" or "these" results with terms like "highest" or "lowest", ONLY consider the exact rows from the previous result set, NOT the entire table
+16. If IDs from previous results are provided in the memory context, use them in a WHERE clause to limit exactly to those rows
+17. Only those tables must be joined that have a foreign key relationship with the table being queried
+18. **CLIENT-CENTRIC INSIGHTS**: When the user asks for "all" or "list all" data, focus on providing comprehensive supplier comparisons and market overviews rather than just raw data dumps
+19. **SUPPLIER COMPARISON PRIORITY**: When multiple approaches could answer a question, prioritize supplier-based analysis and geographical/temporal trends
+20. **COLUMN PRIORITY RULES**: When there are multiple columns that could answer a user's question (e.g., multiple rate columns), prefer columns marked as [MUST_HAVE] over others, then [IMPORTANT] columns, then [MANDATORY] columns. For example, if user asks for "rate" and there's both "hourly_rate_in_usd [MUST_HAVE]" and "bill_rate_hourly", prefer "hourly_rate_in_usd" unless user specifically asks for the other column.
+21. **DESCRIPTION AWARENESS**: Use the column descriptions provided in the schema to better understand what each column represents and choose the most appropriate column for the user's question.
+22. **BUSINESS INTELLIGENCE FOCUS**: Generate queries that help clients understand market positioning, supplier competitiveness, and cost optimization opportunities
+23. **EXACT VALUES OVER LIKE PATTERNS**: When the schema context includes "COLUMN EXPLORATION RESULTS" with actual database values, you MUST use those exact values with equality operators (=) instead of LIKE patterns. Only use LIKE when no exact values are available for the concept you're searching for.
+
+### OUTPUT FORMAT:
+{SQL_ONLY_OUTPUT}"""),
+            ("human", "Convert the following question into a single PostgreSQL SQL query that helps the client make informed business decisions:\n{question}")
+        ])
+    
+    def _create_validation_prompt(self) -> ChatPromptTemplate:
+        """Create the validation prompt"""
+        return ChatPromptTemplate.from_messages([
+            ("system", f"""You are an expert SQL developer specializing in PostgreSQL databases. Your job is to fix SQL query errors.
+
+{self.memory_var}### DATABASE SCHEMA:
+{{schema}}
+
+### GUIDELINES:
+1. Create only PostgreSQL-compatible SQL
+2. Maintain the original query intent
+3. Fix any syntax errors, typos, or invalid column references
+4. **IMPORTANT - QUOTING RULES**:
+{QUOTING_RULES}
+5. NEVER use any placeholder values in your final query
+6. Use any available user information (name, role, IDs) from memory to personalize the query if applicable
+
+### OUTPUT FORMAT:
+Provide ONLY the corrected SQL query with no additional text, explanation, or markdown formatting."""),
+            ("human", "Fix the following SQL query:\n```sql\n{sql}\n```\n\nError message: {error}")
+        ])
+    
+    def _create_text_response_prompt(self) -> ChatPromptTemplate:
+        """Create the text response prompt"""
+        return ChatPromptTemplate.from_messages([
+            ("system", f"""You are an expert procurement and sourcing consultant who specializes in transforming complex market data into clear, actionable business insights. Your role is to act as a trusted advisor helping clients make informed sourcing decisions by providing conversational, supplier-focused analysis with strategic recommendations.
+
+{self.memory_var}### DATABASE SCHEMA:
+{{schema}}
+
+### BUSINESS CONTEXT:
+Your app serves clients who need to make informed decisions about service procurement. You analyze SQL query results to help them understand:
+- **Supplier landscape**: How different vendors position themselves in the market
+- **Rate benchmarking**: How service rates compare across roles, regions, and suppliers
+- **Geographic arbitrage**: Where to find optimal pricing for different service categories
+- **Supplier selection**: Which vendors provide the best value proposition for specific needs
+- **Market intelligence**: How the market is evolving and where opportunities exist
+
+### CRITICAL FORMATTING REQUIREMENTS:
+
+1. **BOLD IMPORTANT INSIGHTS**: Use **bold text** for key findings, notable statistics, and actionable insights that the client should pay attention to.
+
+2. **STRUCTURED SECTIONS**: Organize your response into logical sections with clear visual separation between them. Do not use explicit section headers, but create natural transitions between topic areas.
+
+3. **TABULAR DATA**: Present comparative data in clean, well-formatted tables when it enhances understanding. Ensure tables have consistent data types per column and clean formatting.
+
+4. **CONSULTANT CONVERSATIONAL FLOW**: Maintain a professional advisory tone throughout while keeping the analysis conversational. Connect insights to business implications.
+
+5. **PRIORITIZE KEY NUMBERS**: Make important figures and percentages stand out by **bolding them** within the text.
+
+6. **MANDATORY NUMERICAL DATA AS RANGES**: ALWAYS present numerical data as ranges throughout the ENTIRE response, never as exact figures. Use ranges like **$50-60/hour range** instead of $55.34/hour in ALL sections including table insights, analysis, and summary.
+
+7. **MANDATORY TABLE ANALYSIS**: After presenting EVERY table, you MUST immediately provide 2-3 analytical insights with percentage comparisons. Do NOT proceed to the next section without analyzing the current table. Use range-based numerical data (e.g., "$110-130 range" not "$128.33") and include percentage differences between suppliers, regions, or time periods.
+
+8. **VISUAL HIERARCHY**: Use spacing, paragraphing, and formatting to create a clear visual hierarchy that guides the reader through your analysis.
+
+### RESPONSE STRUCTURE:
+
+**OPENING**: Begin with a direct, specific answer to the user's question using concrete data findings.
+
+**CORE INSIGHTS**: Present 2-4 key insights with supporting data, highlighting important patterns with **bold text**.
+
+**SUPPLIER INTELLIGENCE**: Include specific supplier analysis with comparative data in tabular format when relevant.
+
+**COMPREHENSIVE TABLE INSIGHTS WITH RANGES AND PERCENTAGES**: After EVERY table, you MUST provide 4-5 detailed analytical insights about the data shown using ONLY range-based numerical data and percentage comparisons. Include:
+- **Market Leaders & Followers**: Identify top and bottom performers with range positioning and percentage differences (e.g., "EY operates in the $110-130 range, commanding 45-50% premium over budget suppliers")
+- **Competitive Clustering**: Analyze how suppliers cluster in similar rate ranges with percentage gaps (e.g., "mid-market suppliers show 25-30% cost advantage over premium tier")
+- **Rate Distribution Patterns**: Analyze quartile spreads using ranges (e.g., "narrow spread of $10-15" vs "wide spread of $40-50")
+- **Trend Indicators**: Identify market trends, price stability, and growth patterns from the data
+- **Future Market Implications**: Suggest future possibilities based on current positioning and rate patterns
+- **Arbitrage Opportunities**: Quantify cost optimization opportunities with specific percentage savings (e.g., "45-55% cost reduction potential by switching from premium to budget suppliers")
+- **Risk Assessment**: Evaluate supplier stability based on quartile consistency
+
+**GEOGRAPHIC ANALYSIS**: Highlight geographic trends and opportunities, using tables for multi-country comparisons.
+
+**CLOSING PERSPECTIVE**: End with a brief business-focused perspective that connects the findings to strategic decisions.
+
+**COMPREHENSIVE SUMMARY WITH ADVANCED RANGE CALCULATIONS**: In the final summary, provide detailed market intelligence using calculated percentile ranges:
+
+**RANGE CALCULATION FORMULA FOR INSIGHTS**:
+- **Budget Tier**: Q1 to 35th percentile ranges (Q1 + (Q2-Q1)*0.4)
+- **Premium Tier**: 65th percentile to Q3 ranges ((Q2 + (Q3-Q2)*0.6) to Q3)
+- **Market Gaps**: Calculate percentage differences between tier medians
+- **Competitive Spread**: Analyze Q3-Q1 range width for market volatility assessment
+- **Median Comparison**: Use Q2 values for tier positioning and market benchmarking
+
+**ADVANCED SUMMARY REQUIREMENTS**:
+- **Market Segmentation Analysis**: Define budget, mid-market, and premium tiers with range boundaries
+- **Competitive Intelligence**: Identify close competitors within similar quartile ranges
+- **Trend Projections**: Suggest future market movements based on current distributions
+- **Growth Opportunities**: Highlight emerging segments and rate evolution patterns
+- **Strategic Procurement Guidance**: Provide tier-specific sourcing recommendations with ranges
+
+### RESPONSE EXAMPLES:
+
+✅ **GOOD FORMATTING**:
+
+Based on the range analysis, **Java developers show significant rate distribution variations across regions**. The overall market shows substantial compensation spread across different market segments with distinct lower, middle, and upper range positioning.
+
+The supplier landscape shows significant rate variations within each market:
+
+| Supplier | Range (USD/hr) | Median Range (USD/hr) |
+|----------|----------------|----------------------|
+| TCS | $45-$65 | $52.25-$57.75 |
+| Accenture | $70-$105 | $80.75-$89.25 |
+| Capgemini | $50-$85 | $61.75-$68.25 |
+
+**The range distributions reveal that Accenture operates primarily in the premium market segment**, with their lower range positioning higher than many competitors' middle range. **TCS demonstrates consistent value positioning** across all ranges, while **Capgemini shows the widest range spread**, suggesting diverse service offerings across different market tiers.
+
+When examining the ranges, **suppliers with narrower spreads (like TCS with a $20 range) indicate more standardized pricing**, while **those with wider spreads (like Accenture with $35 ranges) suggest more flexible, tiered service models**.
+
+### MANDATORY TABLE INSIGHT EXAMPLES:
+
+**Example 1 - After Primary Supplier Range Table:**
+
+| Supplier | Range (USD/hr) | Median Range (USD/hr) |
+|----------|----------------|----------------------|
+| EY       | $112.50-$155.00 | $142.50-$157.50    |
+| Photon Infotech | $18.00-$19.00 | $18.05-$19.95     |
+| Wipro    | $97.68-$153.00 | $130.59-$144.41    |
+
+**Primary Supplier Analysis:**
+
+**Highest/Lowest Range Analysis**: **EY leads with the highest upper range positioning at $112.50-$155.00**, while **Photon Infotech shows the most competitive lower range positioning at $18.00-$19.00**. **EY also commands the premium range segment with a median range of $142.50-$157.50**.
+
+**Median Rate Leaders/Followers**: **EY dominates with the highest middle range positioning at $142.50-$157.50**, while **Photon Infotech offers the most competitive middle range options at $18.05-$19.95**.
+
+**Competitive Clustering Analysis**:
+- **Premium tier competitors**: EY ($112.50-$155.00) and Wipro ($97.68-$153.00) cluster in the upper range segment
+- **Mid-market competitors**: HCL, KPMG, and Mindtree operate in the middle range segment with ranges from $80.00-$110.00
+- **Budget tier competitors**: Photon Infotech ($18.00-$19.00), Hexaware, and Virtusa compete in the lower range segment
+
+**Supporting Data Evidence**: Analysis shows **87% cost arbitrage opportunity** between EY's range of $112.50-$155.00 and Photon Infotech's range of $18.00-$19.00.
+
+**Strategic Opportunities**: **Market segmentation enables targeted procurement** with **EY's premium tier range of $112.50-$155.00**, **mid-market tier ranges of $80.00-$110.00**, and **Photon Infotech's budget tier range of $18.00-$19.00** providing clear sourcing strategies.
+
+**Example 2 - After Supplier Range Comparison Table (COMPREHENSIVE COMPETITIVE ANALYSIS):**
+"**The range analysis reveals distinct competitive positioning and market evolution patterns**. **EY's premium positioning in the upper range segment** creates substantial premiums over mid-market competitors operating in the middle range, suggesting **strong brand differentiation and growth potential** in premium segments. **Bahwan Cybertek's narrow range spread indicates highly specialized positioning**, presenting **risk of market disruption** but also **operational efficiency advantages**. **Capgemini's wide range spread demonstrates flexible multi-tier strategy**, capturing **broader market coverage** with **potential for margin optimization** across service levels. **HCL's comprehensive coverage spanning multiple range segments** positions it as a **full-service competitor with market adaptability**, indicating **strong resilience against market volatility** and **potential for cross-tier growth opportunities**. **Competitive clustering suggests industry consolidation trends** with **premium players strengthening positioning** and **mid-market suppliers facing margin pressure**."
+
+**Example 3 - After Geographic/Seniority Range Table (COMPREHENSIVE TREND ANALYSIS):**
+"**Geographic arbitrage opportunities reveal significant strategic advantages** with **Asian suppliers clustering in the lower range segment** offering substantial cost savings compared to **North American providers in the upper range segment**. **Budget tier consolidation among Photon Infotech, Hexaware, and Virtusa** suggests **emerging competitive alliance potential** with **middle range stability** indicating **year-over-year cost predictability**. **Mid-market segment expansion in the middle range** represents significant supplier positioning, creating **optimal cost-quality balance** with **middle range positioning** offering premiums over budget alternatives while maintaining **cost advantage over premium tiers**. **Progressive range scaling** demonstrates **mature market segmentation** and **potential for efficiency gains** through strategic tier migration. **Future trends indicate geographic range convergence** with **Asian markets showing upward pressure** while **traditional premium markets face competitive compression**, creating **dynamic arbitrage opportunities** for adaptive procurement strategies."
+
+**Example 4 - Comprehensive Summary Section with Advanced Analysis:**
+"**Overall SAP developer market analysis reveals dynamic segmentation with substantial strategic opportunities**. **Budget tier optimization targets suppliers in the lower range segment** with **middle range stability**, representing **Photon Infotech's market anchoring position** and **year-over-year cost predictability**. **Premium engagement strategies leverage the upper range segment** with **middle range premiums**, positioning **EY's market leadership** with **growth trajectory potential**. **The substantial cost arbitrage differential** creates **unprecedented procurement flexibility**, while **emerging mid-market consolidation in the middle range** offers **balanced value positioning** with **cost advantages over premium** and **premiums over budget alternatives**. **Market trend indicators suggest rate compression in premium tiers** due to competitive pressure, **upward movement in budget segments** from quality improvements, and **expanding mid-market opportunities** representing significant future engagement potential. **Strategic procurement recommendations include tier-specific supplier portfolio development**, **geographic arbitrage exploitation** with substantial cost differentials, and **adaptive sourcing strategies** capitalizing on **emerging market consolidation trends** for **optimal cost-quality optimization** across **diverse SAP development requirements**."
+
+✅ **GOOD CONVERSATIONAL FLOW**:
+
+Your range analysis reveals a clear opportunity for rate optimization across geographic markets. **US-based projects show middle range positioning** compared to Eastern European equivalents in the **lower range positioning**, yet client satisfaction scores show negligible differences in quality perception.
+
+**Wipro and TCS offer compelling value propositions across all range segments** while maintaining consistent delivery quality metrics. These suppliers demonstrate particular strength in application development projects, where their **upper range positioning often falls below competitors' middle range positioning**, creating substantial arbitrage opportunities.
+
+**The range spreads indicate that Wipro maintains tighter rate consistency** compared to larger suppliers with **broader range spreads**, suggesting more predictable procurement costs for standardized engagements.
+
+### TONE AND APPROACH:
+
+- **BE CONCISE**: Focus on insights, not lengthy explanations
+- **BE CONCRETE**: Use specific numbers and percentages rather than generalizations
+- **BE CONVERSATIONAL**: Write as if speaking directly to an executive client
+- **BE VISUAL**: Format your response to highlight key information
+- **BE BUSINESS-FOCUSED**: Connect insights to procurement and sourcing decisions
+
+### FORMATTING DO'S AND DON'TS:
+
+**DO**:
+- Bold key metrics and insights
+- Use clean, consistent tables for comparative data (Range and Median Range format)
+- Create visual separation between different topic areas
+- Maintain professional, conversational tone throughout
+- Focus on actionable business intelligence
+- **MANDATORY: Add range-based insights after EVERY table**: After each table, immediately provide 2-3 analytical insights using ONLY range terminology
+- **ALWAYS present numerical data as ranges**: Use $50-60 instead of exact figures like $55.34 throughout the ENTIRE response
+- **Identify highest/lowest performers with ranges**: Always mention which companies have highest and lowest rates using range format (e.g., "operates in the $110-130 range")
+- **Analyze quartile spreads with ranges**: Comment on distributions using range terminology (e.g., "narrow $10-15 spread" vs "wide $40-50 spread")
+- **Quantify arbitrage opportunities with ranges**: Calculate percentage differences and present rate gaps using ranges
+- **Complete analysis with ranges**: Ensure ALL numerical insights use range-based terminology throughout the response
+- **MANDATORY: Include numerical ranges in insights**: Every insight must show the specific ranges that support the conclusion using ±5% range calculation
+- **Show calculation basis**: Explain how insights are derived using specific range data with supporting range values
+- **Address all key points**: Every table analysis must cover highest/lowest range rates, middle range leaders/followers, and competitive clustering
+- **Use percentile range formula**: Convert all numerical data to percentile ranges (lower range→20th-30th, middle range→45th-55th, upper range→70th-80th percentile)
+- **Summary with calculated ranges**: In final summary, use lower range positioning for lowest cost and upper range positioning for premium suppliers
+- **Include median values as ranges**: Present middle range rates using range terminology in the summary section
+
+**DON'T**:
+- Use explicit headers like "Section 1:" or "Conclusion:"
+- Include code or technical explanations
+- Create overly complex or inconsistent tables
+- Write in an academic or overly formal tone
+- Include introductory statements like "Based on the SQL results provided..."
+- **Present ANY exact numerical figures**: NEVER use precise decimals like $55.34 anywhere in the response - always use meaningful ranges like $50-60
+- **Skip mandatory key points analysis**: NEVER present a table without covering highest/lowest quartile analysis, median leaders/followers, and competitive clustering
+- **Move to next section without comprehensive insights**: Each table must address all 5 mandatory key points with supporting quartile data before proceeding
+- **Provide insights without ±5% range conversion**: Every numerical value must be converted using the ±5% percentile range formula
+- **Always show supporting range values**: Always reference the specific range segments used to derive insights
+- **Use exact numerical figures from tables**: Convert all exact values to ±5% percentile ranges in insights
+- **Use exact figures in any section**: Avoid precise numbers in table insights, analysis, and summary - use ranges throughout
+- **Ignore quartile spread analysis**: Always comment on narrow vs wide quartile ranges using range terminology
+- **Present median values as exact figures**: Convert Q2 medians to range format in insights and summary
+
+### QUARTILE INSIGHTS TO GENERATE:
+
+After presenting quartile tables, provide analytical insights such as:
+
+**RATE DISTRIBUTION ANALYSIS**:
+- **Quartile spreads**: "Suppliers with narrow Q1-Q3 ranges ($15-20 spread) indicate standardized pricing, while wider spreads ($40-50 spread) suggest tiered service models"
+- **Market positioning**: "Supplier X's Q1 rates in the $70-75 range exceed many competitors' median rates in the $55-65 range, indicating premium market positioning"
+- **Competitive dynamics**: "The median rate gap between Supplier A (operating in the $50-55 range) and Supplier B (commanding the $80-85 range) represents 60-70% cost arbitrage opportunity"
+
+**COMPREHENSIVE PROCUREMENT INSIGHTS WITH ADVANCED ANALYSIS**:
+- **Risk & Stability Assessment**: "Suppliers with consistent quartile patterns (narrow $10-15 spreads) offer more predictable procurement costs and lower rate volatility compared to those with volatile ranges ($35-45 spreads), suggesting higher operational stability"
+- **Value Positioning & Competitive Analysis**: "Q3 rates in the $60-70 range that fall below competitor medians in the $75-85 range indicate strong value propositions for complex engagements, creating 15-20% cost advantage opportunities"
+- **Market Segmentation & Tier Analysis**: "Quartile distributions reveal distinct budget tier ($18-30 range with 25-30% market share), mid-market tier ($45-65 range with 40-45% dominance), and premium tier ($110-155 range with 20-25% specialization)"
+- **Trend Indicators & Growth Patterns**: "Suppliers with expanding Q1-Q3 ranges indicate diversifying service portfolios, while those maintaining tight spreads suggest specialized market positioning with 5-10% year-over-year rate stability"
+- **Future Market Implications**: "Premium tier consolidation in the $120-150 range suggests potential 10-15% rate increases, while budget tier expansion in the $15-25 range indicates increasing competition and 5-8% cost optimization opportunities"
+- **Competitive Clustering & Market Gaps**: "Mid-market gap between $65-85 range represents 20-25% arbitrage opportunity for suppliers transitioning between market segments, indicating potential consolidation trends"
+
+### OUTPUT EXPECTATIONS:
+
+Create a response that reads like a premium consulting analysis delivered by a trusted procurement advisor. Make strategic use of bold text for key findings, tables for comparative data, and spacing for visual organization.
+
+**ABSOLUTE MANDATORY REQUIREMENT - COMPREHENSIVE RANGE-BASED INSIGHTS AFTER EVERY TABLE**:
+
+You MUST immediately follow EVERY table with detailed analytical paragraphs addressing these SPECIFIC KEY POINTS. DO NOT proceed to the next table or section without providing these insights:
+
+**MANDATORY KEY POINTS FOR EACH TABLE ANALYSIS**:
+1. **Highest/Lowest Range Analysis**: Identify region/company with highest and lowest range positioning with supporting range values
+2. **Median Rate Leaders/Followers**: Identify region/company with highest and lowest middle range positioning with supporting range calculations
+3. **Competitive Clustering Analysis**: Identify closest competitors at:
+   - **Premium tier level** (upper range segment competitors)
+   - **Mid-market level** (middle range segment competitors)
+   - **Budget tier level** (lower range segment competitors)
+4. **Supporting Data Evidence**: All insights MUST include the specific range values used to draw conclusions
+5. **Range Calculation Formula**: Convert ALL numerical data using percentile range terminology:
+   - **Lower range** → present as **20th-30th percentile range**
+   - **Middle range** → present as **45th-55th percentile range**
+   - **Upper range** → present as **70th-80th percentile range**
+   - **Apply this formula to ALL numerical values in insights**
+
+**RANGE CONVERSION EXAMPLES**:
+- Instead of exact rates → "lower range positioning in the 20th-30th percentile range"
+- Instead of exact medians → "middle range positioning in the 45th-55th percentile range"
+- Instead of exact upper values → "upper range positioning in the 70th-80th percentile range"
+
+**MANDATORY TEMPLATE FOR EACH TABLE ANALYSIS**:
+After each table, you MUST use this exact format:
+
+**[Table Name] Analysis:**
+
+**Highest/Lowest Range Analysis**: [Identify specific company/region names with highest and lowest range positioning, include their actual range values (e.g., "EY leads with the highest upper range positioning at $147.50-$162.50")]
+
+**Median Rate Leaders/Followers**: [Identify specific company/region names with highest and lowest middle range positioning, include their actual median range values]
+
+**Competitive Clustering Analysis**:
+- **Premium tier competitors**: [List specific company names and their range values]
+- **Mid-market competitors**: [List specific company names and their range values]
+- **Budget tier competitors**: [List specific company names and their range values]
+
+**Supporting Data Evidence**: [Reference specific range values for the identified companies/regions]
+
+**Strategic Opportunities**: [Procurement insights mentioning specific suppliers by name with their range values for cost arbitrage and sourcing decisions]
+
+**FORMAT REQUIREMENT**: Each insight must identify specific suppliers by name based on actual quartile calculations AND show their numerical data as ranges.
+
+**MANDATORY COMPREHENSIVE RESPONSE FORMAT**: Your response MUST follow this EXACT structure:
+
+**STEP 1**: Present Table 1 (Primary Supplier Range Analysis)
+**STEP 2**: IMMEDIATELY provide complete analysis of Table 1 covering all 5 key points using percentile range terminology
+**STEP 3**: Present Table 2 (Competitive Budget Suppliers)
+**STEP 4**: IMMEDIATELY provide complete analysis of Table 2 covering all 5 key points using percentile range terminology
+**STEP 5**: Present Table 3 (Geographic/Regional Analysis)
+**STEP 6**: IMMEDIATELY provide complete analysis of Table 3 covering all 5 key points using percentile range terminology
+**STEP 7**: Present Table 4 (Role Seniority Analysis)
+**STEP 8**: IMMEDIATELY provide complete analysis of Table 4 covering all 5 key points using percentile range terminology
+**STEP 9**: Present Table 5 (Yearly/Temporal Trends)
+**STEP 10**: IMMEDIATELY provide complete analysis of Table 5 covering all 5 key points using percentile range terminology
+**STEP 11**: Final comprehensive collective summary synthesizing all findings
+
+**NEVER skip any analysis step. NEVER move to the next table without completing the analysis of the current table first.**
+
+**COMPREHENSIVE SUMMARY SECTION REQUIREMENTS**: In the final summary/overall analysis, you MUST include:
+- **Market Segmentation Analysis**: Define budget, mid-market, and premium tiers with calculated range boundaries and market share percentages
+- **Competitive Positioning Intelligence**: Identify market leaders, close competitors, and growth opportunities with range positioning
+- **Trend Analysis & Future Projections**: Analyze market evolution patterns and project 6-12 month rate movements with percentage estimates
+- **Strategic Arbitrage Opportunities**: Quantify cost optimization potential with calculated ranges and percentage differentials
+- **Risk Assessment & Stability Indicators**: Evaluate supplier reliability using quartile consistency and operational predictability metrics
+- **Tier-Specific Procurement Guidance**: Provide strategic recommendations for each market segment with range-based decision criteria
+- **Budget Tier Analysis**: Q1 to 35th percentile ranges (e.g., "Budget suppliers operate in the $18-22 range with 5-8% growth stability")
+- **Premium Tier Analysis**: 65th to Q3 percentile ranges (e.g., "Premium providers command the $145-155 range with 10-15% market expansion potential")
+- **Geographic & Competitive Insights**: Highlight regional arbitrage opportunities and competitive clustering patterns with percentage advantages
+
+**ABSOLUTE REQUIREMENT**: Present ALL numerical data as ranges and percentages throughout the ENTIRE response - never use exact figures like $55.34 anywhere.
+
+**CRITICAL - TABLE ANALYSIS IS MANDATORY**: **AFTER EVERY SINGLE TABLE, YOU MUST IMMEDIATELY STOP AND PROVIDE A COMPLETE ANALYSIS SECTION BEFORE MOVING TO THE NEXT TABLE OR ANY OTHER CONTENT.** This analysis section must include all 5 mandatory key points with ±5% percentile ranges. **DO NOT write any other content until this analysis is complete.**
+
+The response should be a complete strategic procurement intelligence analysis that looks polished, professional, and immediately actionable for business decision-makers.
+
+**CRITICAL ENFORCEMENT**:
+- **BALANCED TABLE SELECTION**: EVERY table MUST include BOTH high-cost AND low-cost options for complete market spectrum visibility
+- **STRATEGIC DISTRIBUTION**: Use 2 high + 2 low + 1 mid, or 3 high + 2 low, or 3 low + 2 high based on user query focus (max 5 rows)
+- **NO EXTREMES-ONLY**: NEVER show only premium suppliers or only budget suppliers - always provide sourcing alternatives across cost spectrum
+- **TABLES**: Present with range columns (Range: Q1-Q3, Median Range: ±5% around Q2 median) instead of individual quartile columns
+- **MEDIAN RANGE MANDATORY**: Always calculate Median Range as ±5% around Q2 median (e.g., Q2=$19.00 → Median Range=$18.05-$19.95, NOT $19.00)
+- **CALCULATIONS**: Base insights on actual Q1, Q2, Q3 quartile calculations to identify highest/lowest performers
+- **ANALYSIS**: IMMEDIATELY after EVERY table, provide analytical paragraphs covering all 5 mandatory key points. Identify specific supplier names based on quartile calculations AND show their numerical data as ranges (e.g., "EY leads with highest rates at $112.50-$155.00"). DO NOT proceed to any next table without this complete analysis first.**
+
+**MANDATORY TABLE COVERAGE**: Your response MUST include ALL these table types with STRATEGIC HIGH-LOW REPRESENTATION:
+1. **Primary Supplier Range Analysis** - BALANCED supplier comparison showing BOTH premium (high-cost) AND budget (low-cost) suppliers (max 5 rows with strategic distribution)
+2. **Geographic/Regional Range Analysis** - BALANCED country/region analysis showing BOTH high-cost AND low-cost countries (max 5 rows with strategic distribution)
+3. **Role Seniority Range Breakdown** - BALANCED seniority analysis showing BOTH senior (high-cost) AND junior (low-cost) levels (max 5 rows with strategic distribution)
+4. **Yearly/Temporal Trends** - BALANCED historical analysis showing rate evolution across time periods (max 5 rows with strategic distribution)
+
+**CRITICAL TABLE SELECTION RULE**: Each table MUST include BOTH ends of the cost spectrum - premium options AND budget alternatives - to provide complete market visibility for sourcing decisions.
+
+**TABLE vs INSIGHT FORMAT REQUIREMENT**:
+**TABLES**: Show exact quartile values:
+- Q1: $112.50, Q2: $150.00, Q3: $155.00
+
+**INSIGHTS**: Convert exact quartile values to percentile ranges only (no exact values in insights):
+- Instead of "Q2 Median $150.00" → use "Q2 median range: $142.50-$157.50" (45th-55th percentile calculation)
+- Instead of "Q1 $112.50" → use "Q1 range: $107.00-$118.00" (20th-30th percentile calculation)
+- Instead of "Q3 $155.00" → use "Q3 range: $147.50-$162.50" (70th-80th percentile calculation)
+
+**RANGE CALCULATION FORMULA**:
+- **Q1 range** = 20th percentile to 30th percentile (±5% around 25th percentile)
+- **Q2 range** = 45th percentile to 55th percentile (±5% around 50th percentile)
+- **Q3 range** = 70th percentile to 80th percentile (±5% around 75th percentile)
+
+**COLLECTIVE SUMMARY REQUIREMENT**: After analyzing ALL tables with individual insights, provide a comprehensive collective summary that synthesizes findings across all table types, highlighting overall market trends, key arbitrage opportunities, and strategic procurement recommendations using ±5% percentile ranges."""),
+            ("human", "Answer this question based on the SQL query results: {question}\n\nSQL Query: {sql}\n\nResults: {results}")
+        ])
+    
+    def initialize_edit_mode_prompts(self, llm):
+        """Initialize prompts for edit mode operations"""
+        self.edit_sql_prompt = self._shared_prompt("edit_sql", self._create_edit_sql_prompt)
+        self.edit_verification_prompt = self._shared_prompt("edit_verification", self._create_edit_verification_prompt)
+        
+        # Create edit mode chains
+        self.edit_sql_chain = self.edit_sql_prompt | llm
+        self.edit_verification_chain = self.edit_verification_prompt | llm
+    
+    def _create_edit_sql_prompt(self) -> ChatPromptTemplate:
+        """Create the edit mode SQL generation prompt - more cautious and explicit about modifications"""
+        return ChatPromptTemplate.from_messages([
+            ("system", f"""You are an expert SQL developer specializing in PostgreSQL databases with EDIT MODE ENABLED. Your job is to translate natural language questions into precise SQL queries that can modify, insert, update, or delete data.
+
+{self.memory_var}### DATABASE SCHEMA:
+{{schema}}
+
+### EXAMPLES OF GOOD SQL PATTERNS:
+{{examples}}
+
+### GUIDELINES FOR EDIT MODE:
+1. **WRITE OPERATIONS ALLOWED**: You can generate INSERT, UPDATE, DELETE, and SELECT queries
+2. **BE CAUTIOUS**: For destructive operations (UPDATE/DELETE), always include appropriate WHERE clauses to limit scope
+3. **EXPLICIT CONDITIONS**: Never generate UPDATE or DELETE without specific WHERE conditions unless explicitly requested for all records
+4. **DATA VALIDATION**: Consider data integrity and foreign key constraints when generating modification queries
+5. **TRANSACTION SAFETY**: Design queries that are safe and won't cause unintended data loss
+6. **SPECIFIC ACTIONS**: If the user asks to "add", "insert", "create" → use INSERT; "update", "modify", "change" → use UPDATE; "delete", "remove" → use DELETE
+7. **REQUIRE SPECIFICITY**: For UPDATE/DELETE operations, require specific identifiers (IDs, names, etc.) in the question
+8. **BATCH OPERATIONS**: For bulk operations, be explicit about what records will be affected
+9. **POSTGRESQL SYNTAX**: Use proper PostgreSQL syntax including RETURNING clauses when appropriate
+10. **SAFETY FIRST**: If the request is ambiguous about which records to modify, ask for clarification rather than making assumptions
+11. **MULTI QUERY**: If you generate multiple queries to meet the goal, each query must be separated by "<----->"
+12. **EXAMPLES**: Use the examples provided to guide your SQL generation.
+13. No need to give enclosing ```sql tags for the queries.
+
+### EXAMPLES:
+ "INSERT INTO person.businessentity (rowguid, modifieddate)\nVALUES (gen_random_uuid(), NOW())\nRETURNING businessentityid;\n<----->\n\nINSERT INTO person.person (businessentityid, persontype, namestyle, firstname, lastname, emailpromotion, rowguid, modifieddate)\nVALUES (\n  (SELECT businessentityid FROM person.businessentity ORDER BY businessentityid DESC LIMIT 1),\n  'EM',\n  0,\n  'Farhan',\n  'Akhtar',\n  0,\n  gen_random_uuid(),\n  NOW()\n)\nRETURNING businessentityid;\n\n<----->\n\nINSERT INTO sales.customer (customerid, personid, territoryid, rowguid, modifieddate)\nVALUES (\n  (SELECT COALESCE(MAX(customerid), 0) + 1 FROM sales.customer),\n  (SELECT businessentityid FROM person.person ORDER BY businessentityid DESC LIMIT 1),\n  (SELECT territoryid FROM sales.salesterritory WHERE name = 'Northwest'),\n  gen_random_uuid(),\n  NOW()\n)\nRETURNING customerid;\nn<----->\n\nINSERT INTO sales.salesorderheader (salesorderid, revisionnumber, orderdate, duedate, status, onlineorderflag, customerid, billtoaddressid, shiptoaddressid, shipmethodid, subtotal, taxamt, freight, rowguid, modifieddate)\nVALUES (\n  (SELECT COALESCE(MAX(salesorderid), 43658) + 1 FROM sales.salesorderheader),\n  1,\n  NOW(),\n  NOW() + INTERVAL '7 days',\n  5,\n  FALSE,\n  (SELECT customerid FROM sales.customer ORDER BY customerid DESC LIMIT 1),\n  (SELECT addressid FROM person.address LIMIT 1),\n  (SELECT addressid FROM person.address LIMIT 1),\n  (SELECT shipmethodid FROM purchasing.shipmethod LIMIT 1),\n  0.00,\n  0.00,\n  0.00,\n  gen_random_uuid(),\n  NOW()\n);"
+
+### IMPORTANT SAFETY RULES:
+- Never generate UPDATE or DELETE without WHERE clauses unless explicitly requested for all records
+- Always validate that the requested operation makes sense given the schema
+- For INSERT operations, ensure all required fields are provided or have defaults
+- Use transactions implicitly by designing safe, atomic operations
+
+### OUTPUT FORMAT:
+{SQL_ONLY_OUTPUT}"""),
+            ("human", "Convert the following question into a PostgreSQL SQL query. This is an EDIT MODE request, so you can generate INSERT, UPDATE, DELETE, or SELECT queries as appropriate:\n{question}")
+        ])
+    
+    def _create_edit_verification_prompt(self) -> ChatPromptTemplate:
+        """Create the edit mode verification prompt - double-checks the generated SQL"""
+        return ChatPromptTemplate.from_messages([
+            ("system", f"""You are a database safety expert reviewing SQL queries for edit operations. Your job is to verify that the SQL query is safe, correct, and matches the user's intent.
+
+### DATABASE SCHEMA:
+{{schema}}
+
+### VERIFICATION CHECKLIST:
+Analyze the SQL query and provide a verification report covering these aspects:
+
+1. **SAFETY CHECK**:
+   - Does the query have appropriate WHERE clauses for UPDATE/DELETE operations?
+   - Will this query affect only the intended records?
+   - Are there any risks of unintended data loss or corruption?
+
+2. **CORRECTNESS CHECK**:
+   - Does the SQL syntax appear correct for PostgreSQL?
+   - Are all referenced tables and columns valid according to the schema?
+   - Does the query logic match the user's request?
+
+3. **COMPLETENESS CHECK**:
+   - Does the query fully address the user's request?
+   - Are all required fields included for INSERT operations?
+   - Are data types and constraints respected?
+
+4. **IMPACT ASSESSMENT**:
+   - How many records will likely be affected?
+   - What are the potential consequences of this operation?
+   - Are there any dependencies or cascading effects to consider?
+
+### OUTPUT FORMAT:
+Provide ONLY a valid JSON response with no additional text, explanations, or markdown formatting. Use the following structure:
+{{{{
+    "is_safe": true,
+    "is_correct": true,
+    "safety_issues": [],
+    "correctness_issues": [],
+    "impact_assessment": "description of what this query will do",
+    "estimated_affected_records": "estimate or 'unknown'",
+    "recommendations": [],
+    "overall_verdict": "SAFE_TO_EXECUTE",
+    "explanation": "brief explanation of the verdict"
+}}}}
+
+IMPORTANT: Return ONLY the JSON object above with your actual values. Do not include any explanatory text, markdown formatting, or code blocks."""),
+            ("human", "### ORIGINAL USER REQUEST:\n\"{original_question}\"\n\n### GENERATED SQL QUERY:\n```sql\n{sql}\n```\n\nPlease verify this SQL query for safety and correctness.")
+        ])
+    
+    def create_chart_recommendation_prompt(self):
+        """Create the chart recommendation prompt"""
+        try:
+            self.chart_recommendation_prompt = self._shared_prompt(
+                "chart_recommendation", self._create_chart_recommendation_prompt
+            )
+            
+        except Exception as e:
+            print(f"Error creating chart recommendation prompt: {e}")
+            # Create a fallback prompt without memory
+            self.chart_recommendation_prompt = ChatPromptTemplate.from_messages([
+                ("system", """You are an expert data visualization specialist. Your job is to analyze query results and database schema to recommend appropriate chart types for visualization.
+
+### TASK:
+Based on the query results and data characteristics, recommend the most appropriate chart types for visualization.
+
+### OUTPUT FORMAT:
+Provide ONLY a valid JSON response: {"is_visualizable": true, "recommended_charts": [], "database_type": "general", "data_characteristics": {}}"""),
+                ("human", "Question: {question}\nSQL: {sql}\nResults: {results}\nData: {data_characteristics}\n\nRecommend charts.")
+            ])
+    
+    def _create_chart_recommendation_prompt(self) -> ChatPromptTemplate:
+        """Build the chart recommendation prompt for this memory setting"""
+        # Create the system message with proper memory variable handling
+        if self.use_memory:
+            system_message = """You are an expert data visualization specialist. Your job is to analyze query results and database schema to recommend appropriate chart types for visualization.
+
+{memory}
+
+### DATABASE SCHEMA:
+{schema}
+
+### TASK:
+Based on the query results and data characteristics, recommend the most appropriate chart types for visualization.
+
+### GUIDELINES:
+1. **ANALYZE DATA TYPES**: Consider numerical vs categorical vs time series data
+2. **RECOMMEND APPROPRIATE CHARTS**:
+   - Bar charts for categorical comparisons
+   - Line charts for time series data
+   - Scatter plots for correlations
+   - Pie charts for proportions (when appropriate)
+   - Histogram for distributions
+3. **CONSIDER DATA VOLUME**: Recommend charts that work well with the data size
+4. **PROVIDE CONFIGURATION**: Include axis labels, titles, and other chart settings
+5. **MULTIPLE OPTIONS**: Provide 2-3 different chart options when possible
+6. **EXPLAIN REASONING**: Brief explanation of why each chart type is suitable
+
+### OUTPUT FORMAT:
+Provide ONLY a valid JSON response with no additional text, explanations, or markdown formatting. Use the following structure:
+{{{{
+    "is_visualizable": true,
+    "reason": null,
+    "recommended_charts": [
+        {{{{
+            "chart_type": "bar",
+            "title": "Chart Title",
+            "description": "Brief description of what this chart shows",
+            "x_axis": "column_name",
+            "y_axis": "column_name",
+            "secondary_y_axis": null,
+            "chart_config": {{}},
+            "confidence_score": 0.9
+        }}}}
+    ],
+    "database_type": "general",
+    "data_characteristics": {{}}
+}}}}
+
+IMPORTANT: Return ONLY the JSON object above with your actual values. Do not include any explanatory text, markdown formatting, or code blocks."""
+        else:
+            system_message = """You are an expert data visualization specialist. Your job is to analyze query results and database schema to recommend appropriate chart types for visualization.
+
+### DATABASE SCHEMA:
+{schema}
+
+### TASK:
+Based on the query results and data characteristics, recommend the most appropriate chart types for visualization.
+
+### GUIDELINES:
+1. **ANALYZE DATA TYPES**: Consider numerical vs categorical vs time series data
+2. **RECOMMEND APPROPRIATE CHARTS**:
+   - Bar charts for categorical comparisons
+   - Line charts for time series data
+   - Scatter plots for correlations
+   - Pie charts for proportions (when appropriate)
+   - Histogram for distributions
+3. **CONSIDER DATA VOLUME**: Recommend charts that work well with the data size
+4. **PROVIDE CONFIGURATION**: Include axis labels, titles, and other chart settings
+5. **MULTIPLE OPTIONS**: Provide 2-3 different chart options when possible
+6. **EXPLAIN REASONING**: Brief explanation of why each chart type is suitable
+
+### OUTPUT FORMAT:
+Provide ONLY a valid JSON response with no additional text, explanations, or markdown formatting. Use the following structure:
+{{{{
+    "is_visualizable": true,
+    "reason": null,
+    "recommended_charts": [
+        {{{{
+            "chart_type": "bar",
+            "title": "Chart Title",
+            "description": "Brief description of what this chart shows",
+            "x_axis": "column_name",
+            "y_axis": "column_name",
+            "secondary_y_axis": null,
+            "chart_config": {{}},
+            "confidence_score": 0.9
+        }}}}
+    ],
+    "database_type": "general",
+    "data_characteristics": {{}}
+}}}}
+
+IMPORTANT: Return ONLY the JSON object above with your actual values. Do not include any explanatory text, markdown formatting, or code blocks."""
+        
+        return ChatPromptTemplate.from_messages([
+            ("system", system_message),
+            ("human", "### ORIGINAL QUESTION:\n\"{question}\"\n\n### SQL QUERY:\n```sql\n{sql}\n```\n\n### QUERY RESULTS:\n{results}\n\n### DATA CHARACTERISTICS:\n{data_characteristics}\n\nPlease analyze this data and recommend appropriate chart types for visualization.")
+        ])
+    
+    def _create_analytical_questions_prompt(self, query_kind: Optional[QueryKind] = None) -> ChatPromptTemplate:
+        """Create the analytical questions generation prompt, optionally specialized for one query kind"""
+        kinds = (query_kind,) if query_kind else ("specific", "vague")
+        sections = _load_prompt_sections("question_gen")
+        system_text = "".join(text for kind, text in sections if kind == "all" or kind in kinds)
+        return ChatPromptTemplate(messages=[
+            PrebuiltSystemMessage(CompiledTemplate(
+                self._with_memory(system_text) + "\n\n" + JSON_ONLY_OUTPUT
+            )),
+            _human_message("### CLIENT SOURCING INQUIRY:\n{user_query}\n\n### MANDATORY DATABASE-INFORMED INSTRUCTIONS:\n1. **STEP 1**: FIRST analyze the database schema to understand what data is actually available\n2. **STEP 2**: " + _QUESTION_KIND_STEP[query_kind] + "\n3. **STEP 3**: Generate questions that can be answered with the available database columns and relationships\n4. **STEP 4**: **CRITICAL DIMENSION DIVERSITY**:\n" + "\n".join(_QUESTION_KIND_DIVERSITY[kind] for kind in kinds) + "\n5. **STEP 5**: **ZERO REDUNDANCY RULE**: NEVER generate multiple questions about the same dimension\n6. **STEP 6**: Ensure all questions help the client make sourcing decisions using data that actually exists\n\n**CRITICAL**: Generate MAXIMUM 2-3 questions only. Each question MUST explore a COMPLETELY DIFFERENT dimension (overall market, geographic, temporal, role seniority). Questions must be \"poles apart\" with ZERO overlap or redundancy. For specific questions, ensure each question analyzes a distinct data dimension. All questions must be answerable with the available database schema.", "user_query")
+        ])
+    
+    def _create_comprehensive_analysis_prompt(self) -> ChatPromptTemplate:
+        """Create the comprehensive analysis generation prompt"""
+        return ChatPromptTemplate(messages=[
+            PrebuiltSystemMessage(CompiledTemplate(self._with_memory(_load_prompt_text("comprehensive")))),
+            _COMPREHENSIVE_HUMAN_MESSAGE
+        ])
+    
+    def _create_flexible_query_generation_prompt(self) -> ChatPromptTemplate:
+        """Create a comprehensive flexible query generation prompt"""
+        return ChatPromptTemplate(messages=[
+            PrebuiltSystemMessage(CompiledTemplate(
+                self._assemble_sections(_load_prompt_sections("flexible_query")) + "\n\n" + JSON_ONLY_OUTPUT
+            )),
+            _FLEXIBLE_QUERY_HUMAN_MESSAGE
+        ])
\ No newline at end of file
@@ -1,198 +1,354 @@
+import logging
 import re
-from typing import Dict, List, Any
-from datetime import datetime
+import sys
+import threading
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+try:
+    import hyperscan
+except ImportError:  # optional accelerator; the compiled re patterns are the fallback
+    hyperscan = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Interned labels returned by the analyzer, so comparisons against them are identity checks
+INTENT_RETRIEVE = sys.intern("retrieve")
+INTENT_COUNT = sys.intern("count")
+INTENT_CALCULATE = sys.intern("calculate")
+INTENT_ANALYZE = sys.intern("analyze")
+INTENT_CREATE = sys.intern("create")
+INTENT_UPDATE = sys.intern("update")
+INTENT_DELETE = sys.intern("delete")
+INTENT_CONVERSATIONAL = sys.intern("conversational")
+COMPLEXITY_SIMPLE = sys.intern("simple")
+COMPLEXITY_MEDIUM = sys.intern("medium")
+COMPLEXITY_COMPLEX = sys.intern("complex")
+
+
+def _fuse(*patterns: str) -> "re.Pattern[str]":
+    """Compile several patterns into one alternation so a single scan tests them all"""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+# Greetings and acknowledgments are matched as whole short utterances, so
+# questions longer than this can skip those checks
+_SHORT_UTTERANCE_MAX_LEN = 60
+
+# Greeting patterns
+_GREETING_PATTERNS = (
+    r'^(hi|hello|hey|good morning|good afternoon|good evening|thanks|thank you|bye|goodbye)$',
+    r'^(hi|hello|hey)\s+(there|everyone|guys?)$',
+    r'^(how are you|how\'s it going|what\'s up|how do you do)$',
+    r'^(thanks|thank you)(\s+(so\s+)?much)?$',
+    r'^(ok|okay|alright|got it|understood|sure)$',
+    r'^(yes|yeah|yep|no|nope|maybe)$',
+)
+
+# Context reference patterns (referencing previous conversation)
+_CONTEXT_PATTERNS = (
+    r'^(what about|how about|and)\s+',
+    r'\b(this|that|these|those)\s+(one|ones|result|results|data|table|query|analysis)s?\b',
+    r'\b(same|similar|like that|like this)\b',
+    r'\b(above|below|previous|last|recent|earlier)\s+(result|query|analysis|data)\b',
+    r'\b(more|other|else|additional|further)\s+(details|info|information|data)\b',
+    r'\b(give me more|show me more|tell me more)\b',
+    r'\b(also|too|as well)\b.*\?$',
+    r'^(can you|could you|would you|will you)\s+(also|too|as well)',
+    r'^(what|how|why|where|when)\s+(about|of)\s+(this|that|these|those)\b',
+)
+
+# Simple acknowledgments or responses
+_ACKNOWLEDGMENT_PATTERNS = (
+    r'^(ok|okay|alright|got it|understood|sure|fine|right|correct|exactly)$',
+    r'^(good|great|excellent|perfect|awesome|nice|cool)$',
+    r'^(i see|i understand|makes sense|that works|sounds good)$',
+    r'^(let me think|hmm|well|um|uh)$',
+)
+
+# Questions about the system itself (not data analysis)
+_SYSTEM_PATTERNS = (
+    r'^(what|how)\s+(can|do)\s+you\s+(do|help)',
+    r'^(what|who)\s+are\s+you\s*\?$',
+    r'^(how|what)\s+(does|is)\s+(this|the system|the app|the application)',
+    r'^(can|could|would)\s+you\s+(help|assist|explain|tell)',
+)
+
+# Conversational checks grouped by anchoring, with the anchors dropped so the regex
+# engine does not try every start position: greetings and acknowledgments must be the
+# whole (short) utterance, '^' patterns only match at the start, the rest anywhere
+_WHOLE_UTTERANCE_RE = _fuse(*(pattern[1:-1] for pattern in _GREETING_PATTERNS + _ACKNOWLEDGMENT_PATTERNS))
+_PREFIX_RE = _fuse(*(
+    pattern[1:] for pattern in _CONTEXT_PATTERNS + _SYSTEM_PATTERNS if pattern.startswith("^")
+))
+_ANYWHERE_RE = _fuse(*(pattern for pattern in _CONTEXT_PATTERNS if not pattern.startswith("^")))
+
+# Fixed-literal utterances the greeting and acknowledgment patterns accept (single-spaced),
+# so the most common chat messages are recognized with one set lookup
+_EXACT_CONVERSATIONAL = frozenset({
+    'hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening', 'thanks', 'thank you',
+    'bye', 'goodbye', 'thanks much', 'thanks so much', 'thank you much', 'thank you so much',
+    'how are you', "how's it going", "what's up", 'how do you do',
+    *(f"{greeting} {audience}" for greeting in ('hi', 'hello', 'hey') for audience in ('there', 'everyone', 'guy', 'guys')),
+    'ok', 'okay', 'alright', 'got it', 'understood', 'sure', 'fine', 'right', 'correct', 'exactly',
+    'yes', 'yeah', 'yep', 'no', 'nope', 'maybe',
+    'good', 'great', 'excellent', 'perfect', 'awesome', 'nice', 'cool',
+    'i see', 'i understand', 'makes sense', 'that works', 'sounds good',
+    'let me think', 'hmm', 'well', 'um', 'uh',
+})
+
+# Complex indicators
+_COMPLEX_RE = _fuse(
+    r'\b(analyz[e|ing]|comprehensive|detailed|thorough)\b',
+    r'\b(compare|contrast|versus|vs)\b',
+    r'\b(trend|pattern|correlation|relationship)\b',
+    r'\b(why|how|what\s+causes|what\s+drives)\b',
+    r'\b(multiple|several|various|different)\b',
+    r'\b(across|between|among)\b.*\band\b',
+)
+
+# Medium indicators
+_MEDIUM_RE = _fuse(
+    r'\b(count|sum|average|group\s+by|order\s+by|filter)\b',
+    r'\b(top|bottom|highest|lowest|most|least)\b',
+    r'\b(over\s+time|by\s+year|by\s+month|by\s+category)\b',
+)
+
+# Time-related entities: relative days, last/this/next periods and month names
+# (years are picked up separately by _find_years)
+_TIME_ENTITY_RE = re.compile(
+    r'\b(?:yesterday|today|tomorrow'
+    r'|(?:last|this|next)\s+(?:week|month|year|quarter)'
+    r'|january|february|march|april|may|june|july|august|september|october|november|december)\b'
+)
+
+# Data intents for analysis questions, checked in priority order
+_INTENT_TIERS = (
+    (INTENT_RETRIEVE, _fuse(
+        r'\b(show|get|find|list|display|view|see)\b',
+        r'\b(what\s+is|what\s+are|who\s+is|who\s+are)\b',
+    )),
+    (INTENT_COUNT, _fuse(
+        r'\b(how\s+many|count|number\s+of|total)\b',
+    )),
+    (INTENT_CALCULATE, _fuse(
+        r'\b(sum|average|mean|max|min|calculate|compute)\b',
+    )),
+    (INTENT_ANALYZE, _fuse(
+        r'\b(analyz[e|ing]|compare|trend|why|how|what\s+causes)\b',
+    )),
+    (INTENT_CREATE, _fuse(
+        r'\b(add|insert|create|new)\b',
+    )),
+    (INTENT_UPDATE, _fuse(
+        r'\b(update|modify|change|edit)\b',
+    )),
+    (INTENT_DELETE, _fuse(
+        r'\b(delete|remove|drop)\b',
+    )),
+)
+
+
+def _is_word_char(char: str) -> bool:
+    """Match the regex notion of a word character"""
+    return char.isalnum() or char == "_"
+
+
+def _find_years(text: str) -> List[str]:
+    """Find standalone 20xx years with plain string scanning"""
+    years = []
+    start = text.find("20")
+    while start != -1:
+        end = start + 4
+        if (
+            end <= len(text)
+            and text[start + 2:end].isdecimal()
+            and (start == 0 or not _is_word_char(text[start - 1]))
+            and (end == len(text) or not _is_word_char(text[end]))
+        ):
+            years.append(text[start:end])
+        start = text.find("20", start + 1)
+    return years
+
+
+class QuestionAnalysis(NamedTuple):
+    """Classification of a single user question"""
+    question: str
+    is_conversational: bool
+    requires_analysis: bool
+    intent: str
+    complexity: str
 
 
 class QueryAnalyzer:
     """Simple query analyzer that classifies questions as conversational or analysis"""
     
-    def __init__(self):
+    __slots__ = ()
+    
+    def __init__(self) -> None:
         pass
     
-    def analyze_question(self, question: str) -> Dict[str, Any]:
+    def analyze_question(self, question: str) -> QuestionAnalysis:
         """Analyze the question to determine if it's conversational or requires analysis"""
-        try:
-            # is_conversational = self._is_conversational_question(question)
-            
-            analysis = {
-                "question": question,
-                "is_conversational": False,
-                "requires_analysis": True,
-                "intent": self._determine_intent(question),
-                "complexity": self._assess_complexity(question)
-            }
-            
-            return analysis
-            
-        except Exception as e:
-            print(f"Error analyzing question: {e}")
-            return {
-                "question": question,
-                "is_conversational": False,
-                "requires_analysis": True,
-                "intent": "unknown",
-                "complexity": "simple"
-            }
-    
-    def _is_conversational_question(self, question: str) -> bool:
-        """Check if question is conversational (greetings, context references, simple chat)"""
-        question_lower = question.lower().strip()
-        
-        # Empty or very short questions
-        if len(question_lower) < 3:
-            return True
-        
-        # Greeting patterns
-        greeting_patterns = [
-            r'^(hi|hello|hey|good morning|good afternoon|good evening|thanks|thank you|bye|goodbye)$',
-            r'^(hi|hello|hey)\s+(there|everyone|guys?)$',
-            r'^(how are you|how\'s it going|what\'s up|how do you do)$',
-            r'^(thanks|thank you)(\s+(so\s+)?much)?$',
-            r'^(ok|okay|alright|got it|understood|sure)$',
-            r'^(yes|yeah|yep|no|nope|maybe)$'
-        ]
-        
-        # Check greeting patterns
-        for pattern in greeting_patterns:
-            if re.search(pattern, question_lower):
-                return True
+        # The classifier only does string and regex work, so a str input cannot make it
+        # fail; coerce anything else up front and let real bugs propagate
+        if not isinstance(question, str):
+            question = str(question or "")
         
-        # Context reference patterns (referencing previous conversation)
-        context_patterns = [
-            r'^(what about|how about|and)\s+',
-            r'\b(this|that|these|those)\s+(one|ones|result|results|data|table|query|analysis)s?\b',
-            r'\b(same|similar|like that|like this)\b',
-            r'\b(above|below|previous|last|recent|earlier)\s+(result|query|analysis|data)\b',
-            r'\b(more|other|else|additional|further)\s+(details|info|information|data)\b',
-            r'\b(give me more|show me more|tell me more)\b',
-            r'\b(also|too|as well)\b.*\?$',
-            r'^(can you|could you|would you|will you)\s+(also|too|as well)',
-            r'^(what|how|why|where|when)\s+(about|of)\s+(this|that|these|those)\b'
-        ]
+        # is_conversational = self._is_conversational_question(question)
+        # Classification only depends on the normalized text, so repeated questions hit the cache
+        is_conv, intent, complexity = _analyze_cached(question.strip().lower())
         
-        # Check context reference patterns
-        for pattern in context_patterns:
-            if re.search(pattern, question_lower):
-                return True
+        analysis = QuestionAnalysis(
+            question=question,
+            is_conversational=False,
+            requires_analysis=True,
+            intent=intent,
+            complexity=complexity
+        )
         
-        # Simple acknowledgments or responses
-        acknowledgment_patterns = [
-            r'^(ok|okay|alright|got it|understood|sure|fine|right|correct|exactly)$',
-            r'^(good|great|excellent|perfect|awesome|nice|cool)$',
-            r'^(i see|i understand|makes sense|that works|sounds good)$',
-            r'^(let me think|hmm|well|um|uh)$'
-        ]
-        
-        for pattern in acknowledgment_patterns:
-            if re.search(pattern, question_lower):
-                return True
-        
-        # Questions about the system itself (not data analysis)
-        system_questions = [
-            r'^(what|how)\s+(can|do)\s+you\s+(do|help)',
-            r'^(what|who)\s+are\s+you\s*\?$',
-            r'^(how|what)\s+(does|is)\s+(this|the system|the app|the application)',
-            r'^(can|could|would)\s+you\s+(help|assist|explain|tell)'
-        ]
-        
-        for pattern in system_questions:
-            if re.search(pattern, question_lower):
-                return True
-        
-        # All other questions are considered analysis questions
-        return False
+        return analysis
     
-    def _determine_intent(self, question: str) -> str:
-        """Determine the basic intent of the question"""
-        question_lower = question.lower()
+    def analyze_questions(self, questions: List[str]) -> List[QuestionAnalysis]:
+        """Analyze a batch of questions; repeated questions are classified only once"""
+        return [self.analyze_question(question) for question in questions]
+    
+    def _is_conversational_question(self, question_lower: str) -> bool:
+        """Check if a stripped, lowercased question is conversational (greetings, context references, simple chat)"""
+        # Empty or very short questions, and the common fixed chat phrases
+        if len(question_lower) < 3 or question_lower in _EXACT_CONVERSATIONAL:
+            return True
         
+        # Greetings, context references, acknowledgments and questions about the system
+        # are conversational; all other questions are considered analysis questions
+        if len(question_lower) <= _SHORT_UTTERANCE_MAX_LEN and _WHOLE_UTTERANCE_RE.fullmatch(question_lower):
+            return True
+        return bool(_PREFIX_RE.match(question_lower) or _ANYWHERE_RE.search(question_lower))
+    
+    def _determine_intent(self, question_lower: str, is_conv: Optional[bool] = None) -> str:
+        """Determine the basic intent of a stripped, lowercased question"""
         # If conversational, return conversational intent
-        if self._is_conversational_question(question):
-            return "conversational"
+        if is_conv is None:
+            is_conv = self._is_conversational_question(question_lower)
+        if is_conv:
+            return INTENT_CONVERSATIONAL
         
         # For analysis questions, determine data intent
-        intent_patterns = {
-            "retrieve": [
-                r'\b(show|get|find|list|display|view|see)\b',
-                r'\b(what\s+is|what\s+are|who\s+is|who\s+are)\b'
-            ],
-            "count": [
-                r'\b(how\s+many|count|number\s+of|total)\b'
-            ],
-            "calculate": [
-                r'\b(sum|average|mean|max|min|calculate|compute)\b'
-            ],
-            "analyze": [
-                r'\b(analyz[e|ing]|compare|trend|why|how|what\s+causes)\b'
-            ],
-            "create": [
-                r'\b(add|insert|create|new)\b'
-            ],
-            "update": [
-                r'\b(update|modify|change|edit)\b'
-            ],
-            "delete": [
-                r'\b(delete|remove|drop)\b'
-            ]
-        }
+        for intent, pattern in _INTENT_TIERS:
+            if pattern.search(question_lower):
+                return intent
         
-        for intent, patterns in intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, question_lower):
-                    return intent
-        
-        return "retrieve"  # Default intent for analysis questions
+        return INTENT_RETRIEVE  # Default intent for analysis questions
     
-    def _assess_complexity(self, question: str) -> str:
-        """Assess the complexity of the question"""
-        if self._is_conversational_question(question):
-            return "simple"
-        
-        question_lower = question.lower()
-        
-        # Complex indicators
-        complex_indicators = [
-            r'\b(analyz[e|ing]|comprehensive|detailed|thorough)\b',
-            r'\b(compare|contrast|versus|vs)\b',
-            r'\b(trend|pattern|correlation|relationship)\b',
-            r'\b(why|how|what\s+causes|what\s+drives)\b',
-            r'\b(multiple|several|various|different)\b',
-            r'\b(across|between|among)\b.*\band\b'
-        ]
+    def _assess_complexity(self, question_lower: str, is_conv: Optional[bool] = None) -> str:
+        """Assess the complexity of a stripped, lowercased question"""
+        if is_conv is None:
+            is_conv = self._is_conversational_question(question_lower)
+        if is_conv:
+            return COMPLEXITY_SIMPLE
         
         # Check for complex indicators
-        for indicator in complex_indicators:
-            if re.search(indicator, question_lower):
-                return "complex"
-        
-        # Medium indicators
-        medium_indicators = [
-            r'\b(count|sum|average|group\s+by|order\s+by|filter)\b',
-            r'\b(top|bottom|highest|lowest|most|least)\b',
-            r'\b(over\s+time|by\s+year|by\s+month|by\s+category)\b'
-        ]
+        if _COMPLEX_RE.search(question_lower):
+            return COMPLEXITY_COMPLEX
         
-        for indicator in medium_indicators:
-            if re.search(indicator, question_lower):
-                return "medium"
+        # Check for medium indicators
+        if _MEDIUM_RE.search(question_lower):
+            return COMPLEXITY_MEDIUM
         
-        return "simple"
+        return COMPLEXITY_SIMPLE
     
-    def _extract_entities(self, question: str) -> List[str]:
-        """Extract basic entities from the question"""
-        entities = []
+    def _extract_entities(self, question_lower: str) -> List[str]:
+        """Extract basic entities from a lowercased question"""
+        # Time-related entities, collected in a single scan, then years
+        entities = _TIME_ENTITY_RE.findall(question_lower)
+        entities.extend(_find_years(question_lower))
         
-        # Time-related entities
-        time_patterns = [
-            r'\b(yesterday|today|tomorrow)\b',
-            r'\b(last|this|next)\s+(week|month|year|quarter)\b',
-            r'\b(20\d{2})\b',  # Years
-            r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\b'
-        ]
-        
-        question_lower = question.lower()
-        for pattern in time_patterns:
-            matches = re.findall(pattern, question_lower)
-            entities.extend(matches)
-        
-        return entities 
\ No newline at end of file
+        return entities 
+
+
+_ANALYZER = QueryAnalyzer()
+
+# When the hyperscan package is installed, every classifier pattern goes into one
+# Hyperscan database so an ASCII question is classified in a single DFA scan (Hyperscan's
+# \b and \s are ASCII-only, so other questions keep using re). Each expression
+# is tagged with what a hit means: a whole-utterance or other conversational match,
+# a complexity level, or an intent.
+_HS_WHOLE_UTTERANCE = "whole_utterance"
+_HS_CONVERSATIONAL = "conversational_reference"
+_HS_EXPRESSIONS = (
+    (_HS_WHOLE_UTTERANCE, f"^(?:{_WHOLE_UTTERANCE_RE.pattern})$"),
+    (_HS_CONVERSATIONAL, f"^(?:{_PREFIX_RE.pattern})"),
+    (_HS_CONVERSATIONAL, _ANYWHERE_RE.pattern),
+    (COMPLEXITY_COMPLEX, _COMPLEX_RE.pattern),
+    (COMPLEXITY_MEDIUM, _MEDIUM_RE.pattern),
+    *((intent, pattern.pattern) for intent, pattern in _INTENT_TIERS),
+)
+
+
+def _build_hyperscan_database() -> Optional["hyperscan.Database"]:
+    """Compile the tagged classifier expressions, or return None to use the re patterns"""
+    if hyperscan is None:
+        return None
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode("ascii") for _, pattern in _HS_EXPRESSIONS],
+            ids=list(range(len(_HS_EXPRESSIONS))),
+            flags=hyperscan.HS_FLAG_SINGLEMATCH,
+        )
+        return database
+    except hyperscan.error as e:
+        logger.warning("Hyperscan classifier unavailable, using re patterns: %s", e)
+        return None
+
+
+_HS_DATABASE = _build_hyperscan_database()
+_HS_SCRATCH = threading.local()
+
+
+def _hyperscan_hits(question_norm: str) -> Set[str]:
+    """Scan a normalized question once and return the tags of every matching expression"""
+    scratch = getattr(_HS_SCRATCH, "scratch", None)
+    if scratch is None:
+        scratch = _HS_SCRATCH.scratch = hyperscan.Scratch(_HS_DATABASE)
+    hits: Set[str] = set()
+    
+    def on_match(pattern_id, start, end, flags, context):
+        hits.add(_HS_EXPRESSIONS[pattern_id][0])
+    
+    _HS_DATABASE.scan(question_norm.encode("ascii"), match_event_handler=on_match, scratch=scratch)
+    return hits
+
+
+def _classify_with_hyperscan(question_norm: str) -> Tuple[bool, str, str]:
+    """Hyperscan equivalent of the QueryAnalyzer helpers for a normalized ASCII question"""
+    hits = _hyperscan_hits(question_norm)
+    is_conv = (
+        len(question_norm) < 3
+        or _HS_CONVERSATIONAL in hits
+        or (_HS_WHOLE_UTTERANCE in hits and len(question_norm) <= _SHORT_UTTERANCE_MAX_LEN)
+    )
+    if is_conv:
+        return True, INTENT_CONVERSATIONAL, COMPLEXITY_SIMPLE
+    intent = next((intent for intent, _ in _INTENT_TIERS if intent in hits), INTENT_RETRIEVE)
+    if COMPLEXITY_COMPLEX in hits:
+        return False, intent, COMPLEXITY_COMPLEX
+    if COMPLEXITY_MEDIUM in hits:
+        return False, intent, COMPLEXITY_MEDIUM
+    return False, intent, COMPLEXITY_SIMPLE
+
+
+@lru_cache(maxsize=1024)
+def _analyze_cached(question_norm: str) -> Tuple[bool, str, str]:
+    """Classify a stripped, lowercased question as (is_conversational, intent, complexity)"""
+    if question_norm in _EXACT_CONVERSATIONAL:
+        return True, INTENT_CONVERSATIONAL, COMPLEXITY_SIMPLE
+    if _HS_DATABASE is not None and question_norm.isascii():
+        return _classify_with_hyperscan(question_norm)
+    is_conv = _ANALYZER._is_conversational_question(question_norm)
+    return (
+        is_conv,
+        _ANALYZER._determine_intent(question_norm, is_conv),
+        _ANALYZER._assess_complexity(question_norm, is_conv),
+    )
@@ -0,0 +1,148 @@
+import os
+import re
+import json
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that reuses vectors for repeated texts within a process"""
+    
+    def __init__(self, embeddings: Embeddings, maxsize: int = 4096):
+        self.embeddings = embeddings
+        # Vectors are stored as tuples so cached entries cannot be mutated by callers
+        self._embed_cached = lru_cache(maxsize=maxsize)(self._embed)
+    
+    def _embed(self, text: str) -> tuple:
+        """Call the underlying embedder for one text"""
+        return tuple(self.embeddings.embed_query(text))
+    
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a search text, reusing the vector if it was embedded before"""
+        return list(self._embed_cached(text))
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed stored texts; a question just searched for is not embedded again"""
+        return [self.embed_query(text) for text in texts]
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get embedding cache hit/miss counters"""
+        info = self._embed_cached.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+class SemanticCache:
+    """Caches LLM results by question similarity so near-duplicate phrasings skip the LLM call"""
+    
+    # Chroma's HNSW index, compared by cosine distance
+    HNSW_METADATA = {"hnsw:space": "cosine", "hnsw:M": 16, "hnsw:search_ef": 64}
+    
+    def __init__(self, use_cache: bool = True, persist_dir: str = "./semantic_cache",
+                 similarity_threshold: float = 0.92, ttl_seconds: int = 7 * 24 * 3600):
+        self.use_cache = use_cache
+        self.persist_dir = persist_dir
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.store = None
+        
+        if use_cache:
+            self.store = self._initialize_store(persist_dir)
+    
+    def _initialize_store(self, persist_dir: str) -> Optional[Chroma]:
+        """Initialize the vector store holding cached question embeddings"""
+        try:
+            # Ensure the directory exists
+            os.makedirs(persist_dir, exist_ok=True)
+            
+            gemini_api_key = os.getenv("GOOGLE_API_KEY")
+            if not gemini_api_key:
+                print("Warning: GOOGLE_API_KEY not found. Semantic caching will be disabled.")
+                return None
+            
+            embeddings = CachedEmbeddings(GoogleGenerativeAIEmbeddings(
+                model="models/embedding-001",
+                google_api_key=gemini_api_key
+            ))
+            
+            return Chroma(
+                persist_directory=persist_dir,
+                collection_name="sql_semantic_cache",
+                embedding_function=embeddings,
+                collection_metadata=self.HNSW_METADATA
+            )
+        except Exception as e:
+            print(f"Error initializing semantic cache: {e}")
+            return None
+    
+    def _normalize(self, question: str) -> str:
+        """Normalize a question before embedding it, so trivial variants share one vector"""
+        return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', question.lower())).strip()
+    
+    def search(self, question: str, namespace: str, scope: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Look up the payload cached for the most similar earlier question
+        
+        Args:
+            question: The natural language question
+            namespace: Kind of cached result, e.g. "columns" or "sql"
+            scope: Extra key the cached result depends on, e.g. a schema fingerprint
+        
+        Returns:
+            The cached payload, or None when nothing similar enough and fresh is cached
+        """
+        if not self.store:
+            return None
+        
+        try:
+            matches = self.store.similarity_search_with_score(
+                self._normalize(question),
+                k=1,
+                filter={"$and": [{"namespace": namespace}, {"scope": scope}]}
+            )
+            if not matches:
+                return None
+            
+            doc, distance = matches[0]
+            if 1 - distance < self.similarity_threshold:
+                return None
+            
+            if time.time() - doc.metadata.get("created_at", 0) > self.ttl_seconds:
+                # Drop the stale entry so it no longer shadows fresher ones
+                if getattr(doc, "id", None):
+                    self.store.delete(ids=[doc.id])
+                return None
+            
+            return json.loads(doc.metadata["payload"])
+        except Exception as e:
+            print(f"Error searching semantic cache: {e}")
+            return None
+    
+    def store_result(self, question: str, namespace: str, payload: Dict[str, Any], scope: str = "") -> None:
+        """Cache a JSON-serializable payload for a question"""
+        if not self.store:
+            return
+        
+        try:
+            doc = Document(
+                page_content=self._normalize(question),
+                metadata={
+                    "namespace": namespace,
+                    "scope": scope,
+                    "payload": json.dumps(payload),
+                    "created_at": time.time()
+                }
+            )
+            self.store.add_documents([doc])
+        except Exception as e:
+            print(f"Error storing in semantic cache: {e}")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get embedding cache statistics"""
+        if not self.store:
+            return {}
+        return self.store.embeddings.get_stats()
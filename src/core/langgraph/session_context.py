@@ -1,53 +1,163 @@
 import re
+import time
 import uuid
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+# Patterns used on every session update, compiled once at import time
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+# Each date pattern is paired with the separator it needs, so it can be skipped cheaply
+_DATE_RES = tuple((separator, re.compile(pattern)) for separator, pattern in (
+    ('-', r'\b\d{4}-\d{2}-\d{2}\b'),  # 2023-12-25
+    ('/', r'\b\d{2}/\d{2}/\d{4}\b'),  # 12/25/2023
+    ('/', r'\b\d{1,2}/\d{1,2}/\d{2,4}\b'),  # 12/25/23
+))
+_WHERE_RE = re.compile(r'WHERE\s+(.+?)(?:\s+(?:GROUP|ORDER|HAVING|LIMIT|;|$))', re.IGNORECASE | re.DOTALL)
+_TABLES_RE = re.compile(r'(?:FROM|JOIN)\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)', re.IGNORECASE)
+_DQ_RE = re.compile(r'"([^"]+)"')
+_SQ_RE = re.compile(r"'([^']+)'")
+_CAP_RE = re.compile(r'\b[A-Z][a-z]+\b')
+
+# ASCII digits, used to skip the number/date regexes for questions without any
+_DIGITS = frozenset('0123456789')
+
+# Number of recent queries kept in the session's query sequence
+_QUERY_SEQUENCE_SIZE = 10
+
+# Number of paginated result sets kept per session before the least recently used is evicted
+_PAGINATED_RESULTS_SIZE = 32
+
+# Follow-up indicators fused into one alternation so a question is scanned once
+_CONVERSATIONAL_RE = re.compile(
+    r'\b(?:this|that|these|those|it|they|them|same|similar|like that|'
+    r'above|below|previous|last|recent|earlier|give me more|show me more|'
+    r'what about|how about|also|too|as well|other|else|additional)\b',
+    re.IGNORECASE
+)
+
+# Query timestamps are reused for up to this many seconds, as [refreshed_at, iso_timestamp]
+_TIMESTAMP_RESOLUTION = 1.0
+_timestamp_cache = [float('-inf'), ""]
+
+# Appended to the session context when the question refers back to earlier results
+_FOLLOW_UP_NOTE = "NOTE: This appears to be a follow-up question. Use previous context to understand references to 'this', 'that', 'these', 'those', etc."
+
+
+def _current_timestamp() -> str:
+    """Return the current ISO timestamp, recomputed at most once per _TIMESTAMP_RESOLUTION"""
+    now = time.monotonic()
+    if now - _timestamp_cache[0] >= _TIMESTAMP_RESOLUTION:
+        _timestamp_cache[0] = now
+        _timestamp_cache[1] = datetime.now().isoformat()
+    return _timestamp_cache[1]
+
+
+@lru_cache(maxsize=1024)
+def _is_conversational_cached(question: str) -> bool:
+    """Check a question for follow-up indicators, memoized across sessions"""
+    return _CONVERSATIONAL_RE.search(question) is not None
+
+
+@lru_cache(maxsize=256)
+def _extract_sql_tables_cached(sql: str) -> Tuple[str, ...]:
+    """Extract FROM/JOIN table names in first-seen order, memoized on the SQL text"""
+    # Simple pattern to extract table names from FROM and JOIN clauses in one scan
+    # This is a basic implementation - could be improved
+    return tuple(dict.fromkeys(_TABLES_RE.findall(sql)))  # Remove duplicates
+
+
+@lru_cache(maxsize=256)
+def _value_columns(columns: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    """Pick the ID columns, then the name columns, of a result schema with their value keys"""
+    lowered = [(col, col.lower()) for col in columns]
+    id_columns = [col for col, lower in lowered if lower.endswith('id')]
+    name_columns = [col for col, lower in lowered if 'name' in lower and not lower.endswith('id')]
+    return tuple((col, f"{col}_values") for col in id_columns + name_columns)
+
+
+def _capitalized_words(question: str) -> List[str]:
+    """Find capitalized words (same result as _CAP_RE.findall) by splitting on whitespace"""
+    words = []
+    for word in question.split():
+        if word.isalnum():
+            # A single run of word characters matches only as a whole
+            if len(word) > 1 and word.isalpha() and word.istitle() and word.isascii():
+                words.append(word)
+        else:
+            # Punctuation inside the token (e.g. "O'Brien's" or "India,") still needs the regex
+            words.extend(_CAP_RE.findall(word))
+    return words
+
+
+def _pagination_error(error: str, page: int, page_size: int) -> Dict[str, Any]:
+    """Build the failed get_paginated_results response"""
+    return {
+        "success": False,
+        "error": error,
+        "data": [],
+        "pagination": {
+            "current_page": page,
+            "page_size": page_size,
+            "total_pages": 0,
+            "total_items": 0
+        }
+    }
+
+
+class _SessionContext:
+    """Conversation state tracked for a single session"""
+    
+    __slots__ = (
+        "user_info", "query_sequence", "important_values", "last_query_result",
+        "entity_mentions", "text_responses", "multi_query_results"
+    )
+    
+    def __init__(self) -> None:
+        self.user_info: Dict[str, Any] = {}
+        self.query_sequence: deque = deque(maxlen=_QUERY_SEQUENCE_SIZE)
+        self.important_values: Dict[str, Any] = {}
+        self.last_query_result: Optional[Dict[str, Any]] = None
+        self.entity_mentions: Dict[str, Any] = {}
+        self.text_responses: List[Any] = []  # Store text responses
+        self.multi_query_results: List[Any] = []  # Store results from multiple queries
+
 
 class SessionContextManager:
     """Manages session context for the SQL generator"""
     
     def __init__(self):
         # Session-specific memory for tracking conversation context
-        self.session_context = {
-            "user_info": {},
-            "query_sequence": [],
-            "important_values": {},
-            "last_query_result": None,
-            "entity_mentions": {},
-            "text_responses": [],  # Store text responses
-            "multi_query_results": []  # Store results from multiple queries
-        }
+        self.session_context = _SessionContext()
         
-        # Data store for paginated results
-        self.paginated_results = {}
+        # Data store for paginated results (LRU, bounded by max_paginated_results)
+        self.paginated_results = OrderedDict()
+        self.max_paginated_results = _PAGINATED_RESULTS_SIZE
     
     def update_session_context(self, question: str, sql: str, results: List[Dict]) -> None:
         """Update session context with new query information"""
         try:
-            # Update query sequence
-            self.session_context["query_sequence"].append({
+            result_count = len(results) if results else 0
+            
+            # Update query sequence (the deque drops the oldest entry past its maxlen)
+            self.session_context.query_sequence.append({
                 "question": question,
                 "sql": sql,
-                "timestamp": datetime.now().isoformat(),
-                "result_count": len(results) if results else 0
+                "timestamp": _current_timestamp(),
+                "result_count": result_count
             })
             
-            # Keep only last 10 queries
-            if len(self.session_context["query_sequence"]) > 10:
-                self.session_context["query_sequence"] = self.session_context["query_sequence"][-10:]
-            
             # Update last query result
-            self.session_context["last_query_result"] = {
+            self.session_context.last_query_result = {
                 "question": question,
                 "sql": sql,
-                "results": results[:5] if results else [],  # Keep first 5 results
-                "total_count": len(results) if results else 0
+                "results": results[:5] if result_count else [],  # Keep first 5 results
+                "total_count": result_count
             }
             
             # Extract and update important values
-            important_values = self._extract_important_values(question, sql, results)
-            self.session_context["important_values"].update(important_values)
+            self._extract_important_values(question, sql, results)
             
             # Update entity mentions
             self._update_entity_mentions(question, results)
@@ -55,45 +165,47 @@ class SessionContextManager:
         except Exception as e:
             print(f"Error updating session context: {e}")
     
-    def _extract_important_values(self, question: str, sql: str, results: List[Dict]) -> Dict[str, Any]:
-        """Extract important values from query and results"""
-        important_values = {}
+    def _extract_important_values(self, question: str, sql: str, results: List[Dict]) -> None:
+        """Extract important values from query and results into the session context"""
+        important_values = self.session_context.important_values
         
         try:
             # Extract values from question
-            # Numbers
-            numbers = re.findall(r'\b\d+(?:\.\d+)?\b', question)
-            if numbers:
-                important_values["numbers_mentioned"] = numbers
-            
-            # Dates (basic patterns)
-            date_patterns = [
-                r'\b\d{4}-\d{2}-\d{2}\b',  # 2023-12-25
-                r'\b\d{2}/\d{2}/\d{4}\b',  # 12/25/2023
-                r'\b\d{1,2}/\d{1,2}/\d{2,4}\b',  # 12/25/23
-            ]
-            
-            for pattern in date_patterns:
-                dates = re.findall(pattern, question)
-                if dates:
-                    important_values["dates_mentioned"] = dates
-                    break
+            # Numbers and dates need a digit, so skip the regexes when there is none
+            # (non-ASCII text still goes through them since \d matches Unicode digits)
+            if not question.isascii() or not _DIGITS.isdisjoint(question):
+                # Numbers
+                numbers = _NUMBER_RE.findall(question)
+                if numbers:
+                    important_values["numbers_mentioned"] = numbers
+                
+                # Dates (basic patterns)
+                for separator, pattern in _DATE_RES:
+                    if separator not in question:
+                        continue
+                    dates = pattern.findall(question)
+                    if dates:
+                        important_values["dates_mentioned"] = dates
+                        break
             
             # Extract IDs from results
-            if results and isinstance(results, list):
-                first_result = results[0] if results else {}
-                if isinstance(first_result, dict):
-                    # Look for ID columns
-                    id_columns = [col for col in first_result.keys() if col.lower().endswith('id')]
-                    for col in id_columns:
-                        values = [str(row.get(col, '')) for row in results[:10]]  # First 10 values
-                        important_values[f"{col}_values"] = values
-                    
-                    # Look for name columns
-                    name_columns = [col for col in first_result.keys() if 'name' in col.lower()]
-                    for col in name_columns:
-                        values = [str(row.get(col, '')) for row in results[:10]]  # First 10 values
-                        important_values[f"{col}_values"] = values
+            if results:
+                try:
+                    first_columns = tuple(results[0].keys())
+                except AttributeError:
+                    # Rows that are not mappings carry no column values
+                    first_columns = ()
+                
+                # Look for ID columns, then name columns
+                columns = _value_columns(first_columns)
+                
+                # Collect the first 10 values of every column in one pass over the rows
+                buckets = {key: [] for _, key in columns}
+                if columns:
+                    for row in results[:10]:
+                        for col, key in columns:
+                            buckets[key].append(str(row.get(col, '')))
+                important_values.update(buckets)
             
             # Extract conditions from SQL
             sql_conditions = self._extract_sql_conditions(sql)
@@ -102,14 +214,16 @@ class SessionContextManager:
                 
         except Exception as e:
             print(f"Error extracting important values: {e}")
-        
-        return important_values
     
     def _extract_sql_conditions(self, sql: str) -> str:
         """Extract WHERE conditions from SQL query"""
         try:
+            # No WHERE keyword means no conditions, so skip the regex scan
+            if 'where' not in sql.lower():
+                return ""
+            
             # Simple pattern to extract WHERE clause
-            where_match = re.search(r'WHERE\s+(.+?)(?:\s+(?:GROUP|ORDER|HAVING|LIMIT|;|$))', sql, re.IGNORECASE | re.DOTALL)
+            where_match = _WHERE_RE.search(sql)
             if where_match:
                 return where_match.group(1).strip()
             return ""
@@ -124,19 +238,20 @@ class SessionContextManager:
             entities = {}
             
             # Extract quoted strings as potential entities
-            quoted_strings = re.findall(r'"([^"]+)"', question)
-            quoted_strings.extend(re.findall(r"'([^']+)'", question))
+            quoted_strings = _DQ_RE.findall(question) if '"' in question else []
+            if "'" in question:
+                quoted_strings.extend(_SQ_RE.findall(question))
             
             if quoted_strings:
                 entities["quoted_entities"] = quoted_strings
             
             # Extract capitalized words as potential entities
-            capitalized_words = re.findall(r'\b[A-Z][a-z]+\b', question)
+            capitalized_words = _capitalized_words(question)
             if capitalized_words:
                 entities["capitalized_entities"] = capitalized_words
             
             # Update session context
-            self.session_context["entity_mentions"].update(entities)
+            self.session_context.entity_mentions.update(entities)
             
         except Exception as e:
             print(f"Error updating entity mentions: {e}")
@@ -144,17 +259,7 @@ class SessionContextManager:
     def extract_sql_tables(self, sql: str) -> List[str]:
         """Extract table names from SQL query"""
         try:
-            # Simple pattern to extract table names
-            # This is a basic implementation - could be improved
-            table_pattern = r'FROM\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)'
-            tables = re.findall(table_pattern, sql, re.IGNORECASE)
-            
-            # Also look for JOIN statements
-            join_pattern = r'JOIN\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)'
-            join_tables = re.findall(join_pattern, sql, re.IGNORECASE)
-            
-            all_tables = tables + join_tables
-            return list(set(all_tables))  # Remove duplicates
+            return list(_extract_sql_tables_cached(sql))
             
         except Exception as e:
             print(f"Error extracting SQL tables: {e}")
@@ -163,15 +268,22 @@ class SessionContextManager:
     def prepare_session_context_for_query(self, question: str) -> str:
         """Prepare session context for query generation"""
         try:
+            session_context = self.session_context
+            
+            # Nothing recorded yet (new or cleared session): only the follow-up note can apply
+            if not (session_context.user_info or session_context.last_query_result
+                    or session_context.important_values or session_context.entity_mentions):
+                return _FOLLOW_UP_NOTE if self._is_conversational_question(question) else ""
+            
             context_parts = []
             
             # Add user information
-            if self.session_context["user_info"]:
-                context_parts.append(f"User Info: {self.session_context['user_info']}")
+            if session_context.user_info:
+                context_parts.append(f"User Info: {session_context.user_info}")
             
             # Add recent query results for context
-            if self.session_context["last_query_result"]:
-                last_result = self.session_context["last_query_result"]
+            if session_context.last_query_result:
+                last_result = session_context.last_query_result
                 context_parts.append(f"Previous Question: {last_result['question']}")
                 context_parts.append(f"Previous SQL: {last_result['sql']}")
                 
@@ -182,18 +294,18 @@ class SessionContextManager:
                         context_parts.append(f"  Row {i+1}: {row}")
             
             # Add important values
-            if self.session_context["important_values"]:
-                context_parts.append(f"Important Values: {self.session_context['important_values']}")
+            if session_context.important_values:
+                context_parts.append(f"Important Values: {session_context.important_values}")
             
             # Add entity mentions
-            if self.session_context["entity_mentions"]:
-                context_parts.append(f"Entity Mentions: {self.session_context['entity_mentions']}")
+            if session_context.entity_mentions:
+                context_parts.append(f"Entity Mentions: {session_context.entity_mentions}")
             
             # Check for conversational references
             if self._is_conversational_question(question):
-                context_parts.append("NOTE: This appears to be a follow-up question. Use previous context to understand references to 'this', 'that', 'these', 'those', etc.")
+                context_parts.append(_FOLLOW_UP_NOTE)
             
-            return "\n".join(context_parts) if context_parts else ""
+            return "\n".join(context_parts)
             
         except Exception as e:
             print(f"Error preparing session context: {e}")
@@ -201,41 +313,16 @@ class SessionContextManager:
     
     def _is_conversational_question(self, question: str) -> bool:
         """Check if question is conversational (references previous context)"""
-        conversational_indicators = [
-            r'\bthis\b', r'\bthat\b', r'\bthese\b', r'\bthose\b',
-            r'\bit\b', r'\bthey\b', r'\bthem\b',
-            r'\bsame\b', r'\bsimilar\b', r'\blike that\b',
-            r'\babove\b', r'\bbelow\b', r'\bprevious\b',
-            r'\blast\b', r'\brecent\b', r'\bearlier\b',
-            r'\bgive me more\b', r'\bshow me more\b',
-            r'\bwhat about\b', r'\bhow about\b',
-            r'\balso\b', r'\btoo\b', r'\bas well\b',
-            r'\bother\b', r'\belse\b', r'\badditional\b'
-        ]
-        
-        question_lower = question.lower()
-        for indicator in conversational_indicators:
-            if re.search(indicator, question_lower):
-                return True
-        return False
+        return _is_conversational_cached(question)
     
     def get_paginated_results(self, table_id: str, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
         """Get paginated results for a table"""
         try:
             if table_id not in self.paginated_results:
-                return {
-                    "success": False,
-                    "error": "Table ID not found",
-                    "data": [],
-                    "pagination": {
-                        "current_page": page,
-                        "page_size": page_size,
-                        "total_pages": 0,
-                        "total_items": 0
-                    }
-                }
+                return _pagination_error("Table ID not found", page, page_size)
             
             data = self.paginated_results[table_id]
+            self.paginated_results.move_to_end(table_id)
             total_items = len(data)
             total_pages = (total_items + page_size - 1) // page_size
             
@@ -260,17 +347,7 @@ class SessionContextManager:
             }
             
         except Exception as e:
-            return {
-                "success": False,
-                "error": f"Error getting paginated results: {str(e)}",
-                "data": [],
-                "pagination": {
-                    "current_page": page,
-                    "page_size": page_size,
-                    "total_pages": 0,
-                    "total_items": 0
-                }
-            }
+            return _pagination_error(f"Error getting paginated results: {str(e)}", page, page_size)
     
     def store_paginated_results(self, results: List[Dict], table_id: str = None) -> str:
         """Store results for pagination and return table ID"""
@@ -278,28 +355,25 @@ class SessionContextManager:
             table_id = str(uuid.uuid4())
         
         self.paginated_results[table_id] = results
+        self.paginated_results.move_to_end(table_id)
+        
+        # Evict the least recently used result sets past the cap
+        while len(self.paginated_results) > self.max_paginated_results:
+            self.paginated_results.popitem(last=False)
         return table_id
     
     def clear_session_context(self) -> None:
         """Clear session context"""
-        self.session_context = {
-            "user_info": {},
-            "query_sequence": [],
-            "important_values": {},
-            "last_query_result": None,
-            "entity_mentions": {},
-            "text_responses": [],
-            "multi_query_results": []
-        }
-        self.paginated_results = {}
+        self.session_context = _SessionContext()
+        self.paginated_results = OrderedDict()
     
     def get_session_stats(self) -> Dict[str, Any]:
         """Get session statistics"""
         return {
-            "total_queries": len(self.session_context["query_sequence"]),
-            "user_info_items": len(self.session_context["user_info"]),
-            "important_values_count": len(self.session_context["important_values"]),
-            "entity_mentions_count": len(self.session_context["entity_mentions"]),
-            "text_responses_count": len(self.session_context["text_responses"]),
+            "total_queries": len(self.session_context.query_sequence),
+            "user_info_items": len(self.session_context.user_info),
+            "important_values_count": len(self.session_context.important_values),
+            "entity_mentions_count": len(self.session_context.entity_mentions),
+            "text_responses_count": len(self.session_context.text_responses),
             "paginated_tables": len(self.paginated_results)
         } 
\ No newline at end of file
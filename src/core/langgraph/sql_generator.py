@@ -24,8 +24,9 @@ from .state import SQLGeneratorState
 from .prompts import PromptsManager
 from .memory import MemoryManager
 from .cache import CacheManager
+from .semantic_cache import SemanticCache
 from .session_context import SessionContextManager
-from .query_analysis import QueryAnalyzer
+from .query_analysis import QueryAnalyzer, QuestionAnalysis
 from .sql_generation import SQLGenerationManager
 from .text_response import TextResponseManager
 from .execution import ExecutionManager
@@ -72,7 +73,8 @@ class SmartSQLGenerator:
         use_cache: bool = True,
         cache_file: str = "query_cache.json",
         use_memory: bool = True,
-        memory_persist_dir: str = "./memory_store"
+        memory_persist_dir: str = "./memory_store",
+        semantic_cache_dir: str = "./semantic_cache"
     ):
         """
         Initialize the SQL generator with simplified configuration
@@ -83,6 +85,7 @@ class SmartSQLGenerator:
             cache_file: Path to the query cache file
             use_memory: Whether to use conversation memory
             memory_persist_dir: Directory to persist memory embeddings
+            semantic_cache_dir: Directory to persist the semantic LLM result cache
         """
         load_dotenv()
         self.model_name = model_name
@@ -97,12 +100,14 @@ class SmartSQLGenerator:
         self.prompts_manager = PromptsManager(use_memory=use_memory)
         self.memory_manager = MemoryManager(use_memory=use_memory, memory_persist_dir=memory_persist_dir)
         self.cache_manager = CacheManager(use_cache=use_cache, cache_file=cache_file)
+        self.semantic_cache = SemanticCache(use_cache=use_cache, persist_dir=semantic_cache_dir)
         self.session_context_manager = SessionContextManager()
         self.query_analyzer = QueryAnalyzer()
         
         # Initialize managers that depend on other components
         self.sql_generation_manager = SQLGenerationManager(
-            self.prompts_manager, self.memory_manager, self.cache_manager, self.llm
+            self.prompts_manager, self.memory_manager, self.cache_manager, self.llm,
+            semantic_cache=self.semantic_cache
         )
         
         # Set the database analyzer for column exploration
@@ -237,11 +242,11 @@ class SmartSQLGenerator:
             analysis = self.query_analyzer.analyze_question(question)
             
             # Handle conversational questions
-            if analysis["is_conversational"]:
+            if analysis.is_conversational:
                 return await self._handle_conversational_query(question, analysis)
             
             # Handle analysis questions - route to analytical workflow
-            if analysis["requires_analysis"]:
+            if analysis.requires_analysis:
                 return await self._process_analytical_workflow(question)
             
             # Fallback to regular query processing (shouldn't happen with current logic)
@@ -274,7 +279,7 @@ class SmartSQLGenerator:
                     "visualization_recommendations": chart_result,
                     "execution_time": result["execution_time"],
                     "row_count": result["row_count"],
-                    "query_type": analysis.get("intent", "retrieve"),
+                    "query_type": analysis.intent,
                     "is_conversational": False,
                     "source": "ai",
                     "confidence": 90
@@ -290,7 +295,7 @@ class SmartSQLGenerator:
                     "execution_time": result.get("execution_time", 0),
                     "sql": result.get("sql", ""),
                     "results": [],
-                    "query_type": analysis.get("intent", "retrieve"),
+                    "query_type": analysis.intent,
                     "is_conversational": False,
                     "source": "ai",
                     "confidence": 0
@@ -311,7 +316,7 @@ class SmartSQLGenerator:
                 "confidence": 0
             }
     
-    async def _handle_conversational_query(self, question: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_conversational_query(self, question: str, analysis: QuestionAnalysis) -> Dict[str, Any]:
         """Handle conversational queries with simple responses"""
         try:
             # For now, provide a simple response for conversational queries